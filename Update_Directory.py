@@ -1,12 +1,18 @@
-import os
-import json
+import time
+import argparse
+from datetime import date
 from pathlib import Path
-from bs4 import BeautifulSoup
-from utils.page_builder import build_pages
+from utils.page_builder import build_pages, BUILD_JOBS, WRITE_NAV_FILES
 from utils.update_index import build_index
 from utils.Texts.buzzword_json_builder import convert_buzzwords_to_json
 from utils.write_stats import write_them_stats
-from utils.static_search import generate_search_index, extract_terms_from_table
+from utils.static_search import generate_search_index, extract_page_terms
+from utils.build_context import BuildContext
+from utils.build_cache import DEPENDENCY_PATHS, data_banks_digest
+from utils.page_helpers.parsers import configure_parsers, parser_name, SUPPORTED_PARSERS
+from utils.output_optimizer import precompress_outputs
+from utils.build_metrics import METRICS
+from utils.pipeline import Stage, run_stages, STAGE_WORKERS
 
 
 BASE_HTML_PATH = Path("static/BASE.html")
@@ -19,26 +25,91 @@ TABLE_SUFFIX = ".table.html"
 
 """Module to update HTML pages by processing table files, annotating columns for toggling, generating navigation bars, and building a manifest."""
 
-def write_if_changed(path: Path, content: str):
-    if path.exists() and path.read_text(encoding="utf-8") == content:
-        return False
-    path.write_text(content, encoding="utf-8")
-    return True
 
+def build_stages(ctx: BuildContext, jobs: int = BUILD_JOBS, write_nav_files: bool = WRITE_NAV_FILES,
+                 compress: bool = True) -> list[Stage]:
+    """The build as a stage graph: buzzwords are independent, stats and search indexing both follow the pages."""
+    tables = f"{TABLE_DIR.as_posix()}/*{TABLE_SUFFIX}"
+    parsers = f"{parser_name()}|{parser_name(readonly=True)}"
+    # Tables the build cache missed have to be rendered even if no input file changed
+    cached = all(doc.page_html is not None for doc in ctx.documents)
+
+    # Not data_banks.py: write_them_stats rewrites it concurrently, and the key covers its startup values
+    search_helpers = sorted(p.as_posix() for p in Path("utils/search_helpers").glob("*.py") if p.name != "data_banks.py")
+
+    def search_index():
+        generate_search_index(ctx)
+        print("🧪 Extracting terms from tables for logging:")
+        for doc in ctx.documents:
+            for terms in extract_page_terms(doc):
+                print(f"🔍 {doc.page_name} → {len(terms)} terms")
+
+    stages = [
+        Stage("convert_buzzwords_to_json", convert_buzzwords_to_json,
+              inputs=["utils/Texts/buzzwords.txt", "utils/Texts/buzzword_json_builder.py", "utils/output_optimizer.py"],
+              outputs=["static/data/buzzwords.json"]),
+        Stage("build_pages", lambda: build_pages(ctx, jobs=jobs, write_nav_files=write_nav_files),
+              inputs=[tables, *DEPENDENCY_PATHS, "static/table_css/*.css", "java/*.js", "utils/asset_fingerprint.py",
+                      "utils/artifact_writer.py"],
+              outputs=[f"{OUTPUT_DIR.as_posix()}/*.html", MANIFEST_PATH.as_posix(), "static/data/summary_cards.json"]
+                      + ([f"{NAV_DIR.as_posix()}/*.html"] if write_nav_files else []),
+              key=f"{parsers}|nav_files={write_nav_files}|cached={cached}|banks={data_banks_digest()}"),
+        Stage("write_them_stats", lambda: write_them_stats(ctx), after=["build_pages"],
+              inputs=[tables, "utils/write_stats.py", "utils/search_helpers/stats_build_data.py", "utils/artifact_writer.py"],
+              outputs=["table_stats.json", "utils/search_helpers/data_banks.py"],
+              key=parsers),
+        Stage("generate_search_index", search_index, after=["build_pages"],
+              inputs=[f"{OUTPUT_DIR.as_posix()}/*.html", "utils/static_search.py", *search_helpers,
+                      "assets/wordlist.txt", "assets/ontologies/*.json", "utils/artifact_writer.py"],
+              outputs=["assets/search_index.json", "assets/search_index/*.json"],
+              # data_banks.py as imported at startup; write_them_stats may rewrite the file while this stage runs
+              key=data_banks_digest()),
+        Stage("build_index", build_index, after=["build_pages"],
+              inputs=[MANIFEST_PATH.as_posix(), "static/data/asset-manifest.json", "utils/index_utils/index_base.html",
+                      "utils/Texts/buzzwords.txt", "utils/update_index.py", "utils/page_helpers/html_utils.py",
+                      "utils/output_optimizer.py", "utils/asset_fingerprint.py"],
+              outputs=["index.html"],
+              # The page shows its build date, so a new day rebuilds it
+              key=date.today().isoformat()),
+        Stage("save_cache", ctx.save_cache, after=["build_pages", "write_them_stats", "generate_search_index"]),
+    ]
+    if compress:
+        stages.append(Stage("precompress_outputs", precompress_outputs, after=[s.name for s in stages]))
+    return stages
 
 
 
 if __name__ == "__main__":
-    build_pages()
-    generate_search_index()
-
-    print("🧪 Extracting terms from tables for logging:")
-    for html_file in OUTPUT_DIR.glob("*.html"):
-        soup = BeautifulSoup(html_file.read_text(encoding="utf-8"), "html.parser")
-        for table in soup.find_all("table"):
-            terms = extract_terms_from_table(table)
-            print(f"🔍 {html_file.name} → {len(terms)} terms")
-
-    convert_buzzwords_to_json()
-    build_index()
-    write_them_stats()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Rebuild pages, search index, stats and index.html.")
+    parser.add_argument("--jobs", "-j", type=int, default=BUILD_JOBS,
+                        help="worker processes for page building (0 = one per CPU, default: $BUILD_JOBS or 1)")
+    parser.add_argument("--parser", choices=SUPPORTED_PARSERS,
+                        help="BeautifulSoup backend for every stage (default: $HTML_PARSER or html.parser)")
+    parser.add_argument("--readonly-parser", choices=SUPPORTED_PARSERS,
+                        help="backend for read-only stages such as stats (default: --parser)")
+    parser.add_argument("--nav-files", action="store_true", default=WRITE_NAV_FILES,
+                        help="also write the per-table nav files under utils/navs (default: $WRITE_NAV_FILES)")
+    parser.add_argument("--no-compress", action="store_true",
+                        help="skip writing .gz/.br siblings of the served files")
+    parser.add_argument("--force", action="store_true",
+                        help="run every stage even if its inputs and outputs are unchanged since the last build")
+    parser.add_argument("--stage-workers", type=int, default=STAGE_WORKERS,
+                        help="stages that may run at the same time (default: $STAGE_WORKERS or 4)")
+    parser.add_argument("--profile", nargs="*", metavar="STAGE",
+                        help="run the named stages (all if none named) under cProfile and dump <stage>.pstats "
+                             "to $PROFILE_DIR; page-building worker processes are not profiled")
+    args = parser.parse_args()
+    configure_parsers(args.parser, args.readonly_parser)
+    if args.profile is not None:
+        METRICS.profile = set(args.profile) or {"*"}
+
+    started = time.perf_counter()
+    # Every stage shares one context, so each table is parsed once per run
+    with METRICS.stage("load_tables"):
+        ctx = BuildContext()
+    run_stages(build_stages(ctx, args.jobs, args.nav_files, not args.no_compress),
+               force=args.force, workers=args.stage_workers)
+
+    # Per-stage timings and counters go into build_summary.json next to the page and index summaries
+    METRICS.report()
+    METRICS.write_summary(elapsed_s=round(time.perf_counter() - started, 4))
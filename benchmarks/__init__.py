@@ -0,0 +1 @@
+"""Build and startup benchmarks. Run modules from the project root, e.g. `python -m benchmarks.startup` or `python -m benchmarks.build --sizes 10 100`."""
@@ -0,0 +1,173 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+
+# What a build needs from the project; table sources come from the synthetic corpus instead
+PROJECT_PATHS = ["Update_Directory.py", "utils", "static", "styles", "java", "assets/wordlist.txt", "assets/ontologies"]
+_IGNORED = shutil.ignore_patterns("__pycache__", ".build_cache", "*.gz", "*.br", "drop_nav_*.html", "nav_*.html")
+
+# A stage only counts as regressed when it is slower by both the relative threshold and this many seconds
+MIN_REGRESSION_S = 0.05
+
+"""
+Build scaling benchmark. For each corpus size a throwaway copy of the project is made in a
+temp directory with a synthetic subdex/ (see benchmarks.corpus), and the build stages are
+timed one by one in a fresh interpreter. Results can be written as JSON and compared with a
+stored baseline run:
+
+    python -m benchmarks.build --sizes 10 100 1000 --output baseline.json
+    python -m benchmarks.build --sizes 10 100 1000 --baseline baseline.json --threshold 0.2
+"""
+
+
+def _copy_project(workdir: Path):
+    for rel in PROJECT_PATHS:
+        src = ROOT / rel
+        if src.is_dir():
+            shutil.copytree(src, workdir / rel, ignore=_IGNORED)
+        elif src.exists():
+            (workdir / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, workdir / rel)
+
+
+def _cpu_seconds() -> float:
+    # Includes finished worker processes, so a parallel build_pages reports its real CPU cost
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _run_stages(workdir: Path, jobs: int, warm: bool) -> dict:
+    """Time each stage in a project copy; runs inside the benchmark's child interpreter."""
+    os.chdir(workdir)
+    sys.path.insert(0, str(workdir))
+    from utils.build_context import BuildContext
+    from utils.page_builder import build_pages
+    from utils.static_search import generate_search_index
+    from utils.write_stats import write_them_stats
+    from utils.update_index import build_index
+    from utils.Texts.buzzword_json_builder import convert_buzzwords_to_json
+
+    def pipeline() -> dict:
+        timings = {}
+
+        def timed(stage, fn):
+            wall, cpu = time.perf_counter(), _cpu_seconds()
+            fn()
+            timings[stage] = {"wall_s": round(time.perf_counter() - wall, 4), "cpu_s": round(_cpu_seconds() - cpu, 4)}
+
+        ctx = BuildContext()
+        timed("build_pages", lambda: build_pages(ctx, jobs=jobs))
+        timed("generate_search_index", lambda: generate_search_index(ctx))
+        timed("write_them_stats", lambda: write_them_stats(ctx))
+        timed("build_index", build_index)
+        timed("convert_buzzwords_to_json", convert_buzzwords_to_json)
+        ctx.save_cache()
+        timings["total"] = {key: round(sum(t[key] for t in timings.values()), 4) for key in ("wall_s", "cpu_s")}
+        return timings
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = {"cold": pipeline()}
+        if warm:
+            results["warm"] = pipeline()
+    return results
+
+
+def benchmark(sizes=DEFAULT_SIZES, seed: int = 0, jobs: int = 1, warm: bool = False) -> dict:
+    from benchmarks.corpus import generate_corpus, load_vocabulary
+
+    vocab = load_vocabulary(seed=seed)
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "jobs": jobs,
+        "seed": seed,
+        "sizes": {},
+    }
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"study_tables_bench_{size}_") as tmp:
+            workdir = Path(tmp)
+            _copy_project(workdir)
+            generate_corpus(workdir / "subdex", size, seed, vocab)
+            cmd = [sys.executable, str(Path(__file__).resolve()), "--stages-in", str(workdir), "--jobs", str(jobs)]
+            proc = subprocess.run(cmd + (["--warm"] if warm else []), capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"❌ {size} tables: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+            results["sizes"][str(size)] = {"error": proc.stderr.strip()[-2000:]}
+            continue
+        results["sizes"][str(size)] = json.loads(proc.stdout.strip().splitlines()[-1])
+        _print_size(size, results["sizes"][str(size)])
+    return results
+
+
+def _print_size(size: int, runs: dict):
+    for run, timings in runs.items():
+        stages = ", ".join(f"{stage} {t['wall_s']:.2f}s" for stage, t in timings.items() if stage != "total")
+        print(f"⏱️  {size} tables ({run}): total {timings['total']['wall_s']:.2f}s — {stages}")
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.2) -> list[dict]:
+    """Stages (per size and run) slower than the baseline by more than `threshold` (and MIN_REGRESSION_S)."""
+    regressions = []
+    for size, runs in results["sizes"].items():
+        for run, timings in runs.items():
+            base_timings = baseline.get("sizes", {}).get(size, {}).get(run)
+            if not isinstance(timings, dict) or not isinstance(base_timings, dict):
+                continue
+            for stage, t in timings.items():
+                base = base_timings.get(stage)
+                if not base:
+                    continue
+                delta = t["wall_s"] - base["wall_s"]
+                if delta > MIN_REGRESSION_S and t["wall_s"] > base["wall_s"] * (1 + threshold):
+                    regressions.append({
+                        "size": int(size), "run": run, "stage": stage,
+                        "baseline_s": base["wall_s"], "current_s": t["wall_s"],
+                        "change": round(t["wall_s"] / base["wall_s"] - 1, 3) if base["wall_s"] else None,
+                    })
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each build stage on synthetic corpora of increasing size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="table counts to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="build_pages worker processes (0 = one per CPU)")
+    parser.add_argument("--warm", action="store_true", help="also time a second, build-cache-warm run per size")
+    parser.add_argument("--output", type=Path, help="write results as JSON to this path")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs. the baseline (0.2 = 20%%)")
+    parser.add_argument("--stages-in", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stages_in:
+        print(json.dumps(_run_stages(args.stages_in, args.jobs, args.warm)))
+        sys.exit(0)
+
+    results = benchmark(args.sizes, args.seed, args.jobs, args.warm)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"✅ Benchmark results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for r in regressions:
+            print(f"🐢 {r['stage']} at {r['size']} tables ({r['run']}): {r['baseline_s']:.2f}s → {r['current_s']:.2f}s (+{r['change']:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No stage slower than the baseline by more than {args.threshold:.0%}")
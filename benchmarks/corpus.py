@@ -0,0 +1,112 @@
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+WORDLIST_PATH = ROOT / "assets/wordlist.txt"
+TABLE_SUFFIX = ".table.html"
+
+# Plain words mixed into cells so text reads like the real tables, not a word salad of rare terms
+FILLER = ["patient", "is", "supine", "with", "the", "head", "rotated", "away", "from", "tender", "point",
+          "lateral", "to", "anterior", "posterior", "and", "of", "in", "near", "border", "muscle", "process"]
+TABLE_CLASSES = ["table1", "table2", "table3", "table4"]
+
+"""
+Synthetic table corpus for build benchmarks: realistic *.table.html files shaped like the
+ones in subdex/ — a summary-card meta, a header row, row-divider section rows, rowspan and
+colspan cells, rapid-review (rr-assoc) blocks, and cell text drawn from the medical wordlist.
+Generation is seeded, so a given (count, seed) always produces the same corpus.
+"""
+
+
+def load_vocabulary(path: Path = WORDLIST_PATH, limit: int = 20000, seed: int = 0) -> list[str]:
+    words = [w.strip() for w in path.read_text(encoding="utf-8").splitlines() if w.strip()]
+    rng = random.Random(seed)
+    return rng.sample(words, min(limit, len(words)))
+
+
+def _phrase(rng: random.Random, vocab: list[str]) -> str:
+    words = [rng.choice(vocab) if rng.random() < 0.4 else rng.choice(FILLER) for _ in range(rng.randint(1, 6))]
+    if rng.random() < 0.15:
+        words.append(f"C{rng.randint(1, 7)}")
+    return " ".join(words)
+
+
+def _cell_text(rng: random.Random, vocab: list[str]) -> str:
+    parts = [_phrase(rng, vocab) for _ in range(rng.randint(1, 3))]
+    text = rng.choice([", ", "; ", " - "]).join(parts)
+    if rng.random() < 0.2:
+        text += f" ({_phrase(rng, vocab)})"
+    if rng.random() < 0.1:
+        text = text.replace(" ", "<br>", 1)
+    return text
+
+
+def generate_table(rng: random.Random, vocab: list[str], name: str) -> str:
+    cols = rng.randint(2, 5)
+    rows = rng.randint(8, 60)
+    lines = [
+        f'<meta name="summary-card" content="{"true" if rng.random() < 0.7 else "false"}">',
+        '<div class="table-container">',
+        f'<table class="{rng.choice(TABLE_CLASSES)}" id="{name}">',
+        "    <thead>",
+        "\t\t<tr>",
+        *(f"\t\t\t<th><strong>{_phrase(rng, vocab).title()}</strong></th>" for _ in range(cols)),
+        "\t\t</tr>",
+        "    </thead>",
+        "\t<tbody>",
+    ]
+    spanned = 0  # Rows still covered by a rowspan in the last column
+    for _ in range(rows):
+        lines.append("\t\t<tr>")
+        if rng.random() < 0.1:
+            lines.append(f'\t\t\t<td colspan="{cols}"><strong>{_phrase(rng, vocab).title()}</strong></td>')
+            spanned = 0
+        else:
+            lines.append(f"\t\t\t<td><strong>{_phrase(rng, vocab)}</strong></td>")
+            for col in range(1, cols):
+                last = col == cols - 1
+                if last and spanned:
+                    spanned -= 1
+                    continue
+                if last and rng.random() < 0.05:
+                    spanned = rng.randint(1, 3)
+                    lines.append(f'\t\t\t<td rowspan="{spanned + 1}">{_cell_text(rng, vocab)}</td>')
+                else:
+                    lines.append(f"\t\t\t<td>{_cell_text(rng, vocab)}</td>")
+        lines.append("\t\t</tr>")
+    lines += ["\t</tbody>", "</table>", "</div>"]
+
+    if rng.random() < 0.2:
+        for _ in range(rng.randint(1, 4)):
+            lines += [
+                '<div class="rr-assoc">',
+                f'  <div class="carousel-item"><div class="question">{_phrase(rng, vocab)}?</div>',
+                f'  <div class="answer">{_cell_text(rng, vocab)}</div></div>',
+                "</div>",
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(table_dir: Path, count: int, seed: int = 0, vocab: list[str] = None) -> list[Path]:
+    """Write `count` synthetic table files into table_dir and return their paths."""
+    vocab = vocab or load_vocabulary(seed=seed)
+    rng = random.Random(seed)
+    table_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        name = f"synthetic_{i:05d}"
+        path = table_dir / f"{name}{TABLE_SUFFIX}"
+        path.write_text(generate_table(rng, vocab, name), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic *.table.html corpus.")
+    parser.add_argument("table_dir", type=Path)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate_corpus(args.table_dir, args.count, args.seed)
+    print(f"✅ {args.count} synthetic tables written to {args.table_dir}")
@@ -0,0 +1,62 @@
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules whose import cost is paid on every CLI run or container boot
+ENTRY_POINTS = [
+    "Update_Directory",
+    "utils.update_index",
+    "utils.write_stats",
+    "utils.suggestions",
+]
+
+_TIMER = (
+    "import sys, time; sys.path.insert(0, {root!r}); "
+    "t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+)
+
+"""Cold-start benchmark: times a fresh interpreter importing each entry point."""
+
+
+def time_import(module: str, runs: int = 5) -> dict:
+    """Import `module` in `runs` fresh interpreters and return min/median seconds (or the error)."""
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(root=str(ROOT), module=module)],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"}
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return {"min_s": round(min(samples), 4), "median_s": round(statistics.median(samples), 4), "runs": runs}
+
+
+def run(modules=ENTRY_POINTS, runs: int = 5) -> dict:
+    results = {}
+    for module in modules:
+        results[module] = time_import(module, runs)
+        r = results[module]
+        if "error" in r:
+            print(f"❌ {module}: {r['error']}")
+        else:
+            print(f"⏱️  {module}: median {r['median_s'] * 1000:.1f} ms, min {r['min_s'] * 1000:.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import time of each entry point in fresh interpreters.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write results as JSON to this path")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    results = run(args.modules, args.runs)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"✅ Startup timings written to {args.output}")
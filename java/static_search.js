@@ -5,26 +5,99 @@ const pageRank = {
   labs: 4,
   pharm: 5
 };
-let searchIndex = [];
+const INDEX_BASE = "/study_tables/assets/search_index/";
+const INDEX_VERSION = 2;
+let indexManifest = null;
+const shardCache = new Map();
+let lastResults = [];
 
-async function loadSearchIndex() {
-  const res = await fetch("/study_tables/assets/search_index.json");
-  searchIndex = await res.json();
+/**
+ * Load the small top-level manifest: interned pages/sections and the shard table.
+ */
+async function loadIndexManifest() {
+  if (!indexManifest) {
+    const res = await fetch(INDEX_BASE + "manifest.json");
+    const manifest = await res.json();
+    if (manifest.version !== INDEX_VERSION) {
+      throw new Error(`Unsupported search index version ${manifest.version}`);
+    }
+    indexManifest = manifest;
+  }
+  return indexManifest;
+}
+
+/**
+ * Fetch one prefix shard (once); rows are [term, pageIdx, sectionIdx, medical, keyOffset, cell] sorted by key.
+ */
+function loadShard(prefix) {
+  if (!shardCache.has(prefix)) {
+    const file = indexManifest.shards[prefix].file;
+    shardCache.set(prefix, fetch(INDEX_BASE + file).then(res => res.json()));
+  }
+  return shardCache.get(prefix);
+}
+
+function rowKey(row) {
+  return row[0].slice(row[4]);
+}
+
+/**
+ * Index of the first row whose key is >= q.
+ */
+function lowerBound(rows, q) {
+  let lo = 0;
+  let hi = rows.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (rowKey(rows[mid]) < q) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/**
+ * Deep link for a result: straight to its cell when the index knows it, else the text-search fallback.
+ */
+function resultUrl(entry) {
+  const anchor = entry.cell ? `cell-${entry.cell}` : `highlight-${encodeURIComponent(entry.term)}`;
+  return `pages/${entry.page}#${anchor}`;
 }
 
-function filterSuggestions(query) {
+/**
+ * Scroll to and flag a cell until the next click.
+ */
+function highlightCell(cell) {
+  cell.scrollIntoView({ behavior: "smooth", block: "center" });
+  cell.classList.add("highlight-temp");
+  document.addEventListener("click", () => {
+    document.querySelectorAll(".highlight-temp").forEach(el => el.classList.remove("highlight-temp"));
+  }, { once: true });
+}
+
+async function filterSuggestions(query) {
   const q = query.trim().toLowerCase();
   if (!q) return [];
 
+  const manifest = await loadIndexManifest();
+  const prefixes = q.length >= manifest.prefix_length
+    ? [q.slice(0, manifest.prefix_length)].filter(p => p in manifest.shards)
+    : Object.keys(manifest.shards).filter(p => p.startsWith(q));
+  const shards = await Promise.all(prefixes.map(loadShard));
+
   const seen = new Set();
-  return searchIndex
-    .filter(entry => entry.term.includes(q))
-    .filter(entry => {
-      const key = `${entry.term}-${entry.page}`;
-      if (seen.has(key)) return false;
+  const results = [];
+  shards.forEach(rows => {
+    for (let i = lowerBound(rows, q); i < rows.length && rowKey(rows[i]).startsWith(q); i++) {
+      const [term, pageIdx, sectionIdx, medical, , cell] = rows[i];
+      const page = manifest.pages[pageIdx];
+      const key = `${term}-${page}`;
+      if (seen.has(key)) continue;
       seen.add(key);
-      return true;
-    })
+      results.push({ term, page, section: manifest.sections[sectionIdx], medical: medical === 1, cell });
+    }
+  });
+
+  return results
     .sort((a, b) => {
       const rankA = pageRank[a.page.replace(".html", "")] || 999;
       const rankB = pageRank[b.page.replace(".html", "")] || 999;
@@ -38,8 +111,12 @@ function setupSearch() {
   const datalist = document.getElementById("tableSuggestions");
   if (!input || !datalist) return;
 
-  input.addEventListener("input", () => {
-    const results = filterSuggestions(input.value);
+  let latestQuery = 0;
+  input.addEventListener("input", async () => {
+    const queryId = ++latestQuery;
+    const results = await filterSuggestions(input.value);
+    if (queryId !== latestQuery) return; // A newer keystroke already answered
+    lastResults = results;
     const container = document.getElementById("searchResults");
     container.innerHTML = "";
     if (!results.length) {
@@ -62,8 +139,7 @@ function setupSearch() {
       div.className = "search-result";
       div.innerHTML = `<strong>${entry.term}</strong>`;
       div.onclick = () => {
-        const url = `pages/${entry.page}#highlight-${encodeURIComponent(entry.term)}`;
-        window.location.href = url;
+        window.location.href = resultUrl(entry);
       };
       container.appendChild(div);
     });
@@ -80,36 +156,28 @@ function setupSearch() {
 
   input.addEventListener("change", () => {
     const val = input.value;
-    const match = searchIndex.find(entry => {
+    const match = lastResults.find(entry => {
       const pageName = entry.page.replace(".html", "").replace(/-/g, " ");
       return val === `${entry.term}  —  ${pageName}`;
     });
     if (match) {
-      const url = `pages/${match.page}#highlight-${encodeURIComponent(match.term)}`;
-      window.location.href = url;
+      window.location.href = resultUrl(match);
     }
   });
 }
 
-document.addEventListener("DOMContentLoaded", async () => {
-  await loadSearchIndex();
+document.addEventListener("DOMContentLoaded", () => {
+  // Shards are fetched on the first keystroke; pages without a search box fetch nothing
   setupSearch();
   const hash = decodeURIComponent(location.hash);
-  if (hash.startsWith("#highlight-")) {
+  if (hash.startsWith("#cell-")) {
+    const cell = document.getElementById(hash.slice(1));
+    if (cell) highlightCell(cell);
+  } else if (hash.startsWith("#highlight-")) {
+    // Older links and terms without a known cell: scan the cells for the text
     const term = hash.replace("#highlight-", "").toLowerCase();
-    const cells = Array.from(document.querySelectorAll("td"));
-
-    for (const cell of cells) {
-      if (cell.textContent.toLowerCase().includes(term)) {
-        cell.scrollIntoView({ behavior: "smooth", block: "center" });
-        cell.classList.add("highlight-temp");
-        break;
-      }
-    }
-
-    // Clear highlight on next click
-    document.addEventListener("click", () => {
-      document.querySelectorAll(".highlight-temp").forEach(el => el.classList.remove("highlight-temp"));
-    }, { once: true });
+    const cell = Array.from(document.querySelectorAll("td"))
+      .find(td => td.textContent.toLowerCase().includes(term));
+    if (cell) highlightCell(cell);
   }
 });
\ No newline at end of file
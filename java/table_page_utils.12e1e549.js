@@ -0,0 +1,444 @@
+const originalTableState = new Map();
+
+/**
+ * Clicking a cell hidden by its column reveals just that cell.
+ * A single delegated listener, so rows re-created by reset or shuffle need no rebinding.
+ */
+function attachCellClickListeners() {
+  if (attachCellClickListeners.bound) return;
+  attachCellClickListeners.bound = true;
+  document.addEventListener("click", event => {
+    const cell = event.target.closest("td[data-col]");
+    const table = cell && cell.closest("table");
+    if (table && table.classList.contains("hide-col-" + cell.dataset.col)) {
+      cell.classList.add("revealed");
+    }
+  });
+}
+
+/**
+ * Toggle visibility of a given column index across all tables.
+ * Only a hide-col-N class on each <table> changes; the page's generated
+ * #column-visibility stylesheet does the hiding.
+ */
+function toggleColumn(colIndex) {
+  const className = "hide-col-" + colIndex;
+  const tables = Array.from(document.querySelectorAll("table[data-cols]"));
+  const currentlyHidden = tables.every(table => table.classList.contains(className));
+  tables.forEach(table => {
+    if (!currentlyHidden) {
+      table.querySelectorAll('td.revealed[data-col="' + colIndex + '"]').forEach(cell => cell.classList.remove("revealed"));
+    }
+    table.classList.toggle(className, !currentlyHidden);
+  });
+}
+
+/**
+ * Hide every column of every table (data-cols is the table's width, recorded at build time).
+ */
+function hideAllColumns() {
+  document.querySelectorAll("table[data-cols]").forEach(table => {
+    table.querySelectorAll("td.revealed").forEach(cell => cell.classList.remove("revealed"));
+    for (let col = 0; col < Number(table.dataset.cols); col++) {
+      table.classList.add("hide-col-" + col);
+    }
+  });
+}
+
+/**
+ * Show every column again and forget revealed cells.
+ */
+function showAllColumns() {
+  document.querySelectorAll("table[data-cols]").forEach(table => {
+    Array.from(table.classList)
+      .filter(cls => /^hide-col-\d+$/.test(cls))
+      .forEach(cls => table.classList.remove(cls));
+    table.querySelectorAll("td.revealed").forEach(cell => cell.classList.remove("revealed"));
+  });
+}
+
+/**
+ * Reset column visibility and restore original row order for all tables.
+ */
+function resetColumns() {
+  showAllColumns();
+
+  document.querySelectorAll("table").forEach((table, tableIndex) => {
+    const tbodies = table.querySelectorAll("tbody");
+    const cachedRows = originalTableState.get(tableIndex);
+
+    if (!cachedRows) return;
+
+    tbodies.forEach((tbody, i) => {
+      if (!cachedRows[i]) return;
+      tbody.innerHTML = "";
+      cachedRows[i].forEach(row => tbody.appendChild(row.cloneNode(true)));
+    });
+  });
+  attachCellClickListeners();
+}
+
+function filterRowsByInput(inputId, rowSelector) {
+  const input = document.getElementById(inputId);
+  if (!input) return;
+  const query = input.value.toLowerCase();
+  document.querySelectorAll(rowSelector).forEach(row => {
+    if (row.closest("tfoot") || row.classList.contains("section-divider")) return;
+    const text = row.textContent.toLowerCase();
+    row.style.opacity = text.includes(query) ? "" : "0";
+  });
+}
+
+/**
+ * Shuffle all rows inside all tbody sections of a table,
+ * preserving section-divider rows at the start of each tbody.
+ */
+function shuffleTableRows(table) {
+  const tbodies = table.querySelectorAll("tbody");
+  tbodies.forEach(tbody => {
+    // ❌ Remove rows that are 'row-divider' or contain 'row-divider' <td>
+    tbody.querySelectorAll("tr").forEach(row => {
+      if (
+        row.classList.contains("row-divider") ||
+        row.querySelector("td.row-divider")
+      ) {
+        row.remove();
+      }
+    });
+
+    const rows = Array.from(tbody.querySelectorAll("tr"))
+      .filter(row =>
+        !row.classList.contains("section-divider") &&
+        !row.classList.contains("row-divider") &&
+        !row.closest("tfoot") &&
+        !row.closest("tfoot tr") &&
+        !(row.id && row.id.startsWith("section-"))
+      );
+    const sectionRows = Array.from(tbody.querySelectorAll("tr.section-divider"));
+
+    // Preserve visibility state (row.style.display) before shuffling
+    const rowVisibilityMap = new Map();
+    rows.forEach(row => {
+      rowVisibilityMap.set(row, row.style.display);
+    });
+
+    // Fisher-Yates shuffle
+    for (let i = rows.length - 1; i > 0; i--) {
+      const j = Math.floor(Math.random() * (i + 1));
+      [rows[i], rows[j]] = [rows[j], rows[i]];
+    }
+
+    // Hide section headers before appending
+    sectionRows.forEach(row => {
+      row.style.display = "none";
+    });
+
+    // Clear tbody and re-append only shuffled rows
+    tbody.innerHTML = "";
+
+    // Remove row-specific borders or table-specific styles
+    rows.forEach(row => {
+      row.removeAttribute("style");
+      row.querySelectorAll("td").forEach(td => td.removeAttribute("style"));
+    });
+
+    tbody.innerHTML = "";
+    rows.forEach(row => {
+      // row.classList.remove("row-divider"); // removed as row-divider rows are already removed above
+      row.querySelectorAll("td").forEach(td => td.style.borderBottom = "none");
+      tbody.appendChild(row);
+      // Restore visibility state after shuffle
+      if (rowVisibilityMap.has(row)) {
+        row.style.display = rowVisibilityMap.get(row);
+      }
+    });
+    // Hidden columns live on the table's classes, so they survive the shuffle as they are
+  });
+  attachCellClickListeners();
+}
+
+// Add shuffle button listener for all tables on the page
+document.addEventListener("DOMContentLoaded", () => {
+  // 1. Inject sticky header CSS dynamically
+  const style = document.createElement('style');
+  style.textContent = `
+    thead tr.sticky-header {
+      position: sticky;
+      top: 0;
+      background: #fff;
+      z-index: 2;
+    }
+  `;
+  document.head.appendChild(style);
+
+  const colWidthStyle = document.createElement("style");
+  colWidthStyle.textContent = `
+    thead th {
+      width: max-content !important;
+      white-space: nowrap;
+    }
+    table {
+      table-layout: auto !important;
+      border-collapse: separate !important;
+    }
+  `;
+  document.head.appendChild(colWidthStyle);
+
+  const shuffleBtn = document.getElementById("shuffle-button");
+  if (shuffleBtn) {
+    shuffleBtn.addEventListener("click", () => {
+      document.querySelectorAll("table").forEach(table => shuffleTableRows(table));
+    });
+  }
+
+  // Cache original table row order at load time to support reset
+  document.querySelectorAll("table").forEach((table, tableIndex) => {
+    const tbodies = table.querySelectorAll("tbody");
+    const cachedTbodyRows = [];
+
+    tbodies.forEach(tbody => {
+      const rows = Array.from(tbody.querySelectorAll("tr"));
+      cachedTbodyRows.push(rows.map(row => row.cloneNode(true)));
+    });
+
+    originalTableState.set(tableIndex, cachedTbodyRows);
+  });
+
+  const resetBtn = document.getElementById("reset-button");
+  if (resetBtn) {
+    resetBtn.addEventListener("click", () => {
+      resetColumns();
+    });
+  }
+
+  const hideAllBtn = document.getElementById("hide-all-button");
+  if (hideAllBtn) {
+    hideAllBtn.addEventListener("click", hideAllColumns);
+  }
+
+  // Wire up the "Hide Column" dropdown; its entries are prebuilt from the table headers at build time
+  const hideColBtn = document.getElementById("hide-col-button");
+  const hideColMenu = document.getElementById("hide-col-menu");
+
+  if (hideColBtn && hideColMenu) {
+    hideColBtn.addEventListener("click", () => {
+      const isOpen = hideColMenu.style.display === "block";
+      hideColMenu.style.display = !isOpen && hideColMenu.querySelector(".col-option") ? "block" : "none";
+    });
+
+    hideColMenu.addEventListener("click", (e) => {
+      const option = e.target.closest(".col-option");
+      if (!option) return;
+      toggleColumn(option.dataset.col);
+      hideColMenu.style.display = "none";
+    });
+
+    // Hide dropdown when clicking outside
+    document.addEventListener("click", (e) => {
+      if (!hideColBtn.contains(e.target) && !hideColMenu.contains(e.target)) {
+        hideColMenu.style.display = "none";
+      }
+    });
+  }
+
+  const searchInput = document.getElementById("searchInput");
+  if (searchInput) {
+    searchInput.addEventListener("input", () => {
+      filterRowsByInput("searchInput", "tbody tr td");
+    });
+  }
+
+  attachCellClickListeners();
+
+  // 2. Make the header row containing .th-menu-wrapper sticky
+  const menuWrapperRow = document.querySelector("thead tr");
+  if (menuWrapperRow && menuWrapperRow.querySelector(".th-menu-wrapper")) {
+    menuWrapperRow.classList.add("sticky-header");
+  }
+
+  // Enable click-to-toggle submenu for nav categories, and normal link for those without submenu
+  document.querySelectorAll('.nav_category').forEach(cat => {
+    const submenu = cat.querySelector('.nav_submenu');
+    const anchor = cat.querySelector('a');
+
+    cat.addEventListener('click', (e) => {
+      e.stopPropagation(); // prevent bubbling
+      if (!submenu) {
+        if (anchor && anchor.href) {
+          window.location.href = anchor.href;
+        }
+        return;
+      }
+
+      const isVisible = submenu.style.display === 'block';
+      document.querySelectorAll('.nav_submenu').forEach(sm => sm.style.display = 'none'); // close others
+      submenu.style.display = isVisible ? 'none' : 'block'; // toggle this one
+    });
+  });
+
+  // Close all submenus if clicking outside
+  document.addEventListener('click', () => {
+    document.querySelectorAll('.nav_submenu').forEach(sm => sm.style.display = 'none');
+  });
+
+  // Inject fallback sticky style for 2nd thead row
+  const stickyStyle = document.createElement("style");
+  stickyStyle.textContent = `
+    thead tr.sticky-fallback {
+      position: sticky;
+      top: 0;
+      background: #f7f9fa;
+      z-index: 10;
+      box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+  `;
+  document.head.appendChild(stickyStyle);
+
+  // Inject sticky style for colspan-heading rows
+  const stickyHeaderStyle = document.createElement("style");
+  stickyHeaderStyle.textContent = `
+    thead tr.colspan-heading th {
+      position: sticky;
+      top: 0;
+      z-index: 4;
+      background-color: #d0e5f5;
+    }
+  `;
+  document.head.appendChild(stickyHeaderStyle);
+
+  // Ensure table parent wrappers allow sticky headers in scrollable tables
+  document.querySelectorAll("table").forEach(table => {
+    const wrapper = table.parentElement;
+    if (wrapper && !wrapper.classList.contains("table-scroll-wrapper")) {
+      wrapper.style.overflowX = "auto";
+      wrapper.style.position = "relative";
+    }
+  });
+
+  // Watch second thead row and apply sticky class on scroll
+  document.querySelectorAll("table").forEach(table => {
+    const thead = table.querySelector("thead");
+    if (!thead) return;
+    const rows = thead.querySelectorAll("tr");
+    if (rows.length < 2) return;
+
+    const labelRow = rows[1];
+    const observer = new IntersectionObserver(entries => {
+      entries.forEach(entry => {
+        if (!entry.isIntersecting) {
+          labelRow.classList.add("sticky-fallback");
+        } else {
+          labelRow.classList.remove("sticky-fallback");
+        }
+      });
+    }, { threshold: 1.0 });
+
+    observer.observe(labelRow);
+  });
+
+  document.querySelectorAll("th").forEach(th => th.removeAttribute("style"));
+
+  // Add .colspan-heading class to rows with <th colspan>
+  document.querySelectorAll("table").forEach(table => {
+    const thead = table.querySelector("thead");
+    if (!thead) return;
+    const rows = thead.querySelectorAll("tr");
+    rows.forEach(row => {
+      const th = row.querySelector("th[colspan]");
+      if (th) {
+        row.classList.add("colspan-heading");
+      }
+    });
+  });
+});
+
+document.querySelectorAll(".th-dropdown a").forEach(link => {
+  link.addEventListener("click", (event) => {
+    const colIndex = link.getAttribute("data-col");
+    if (colIndex !== null) toggleColumn(colIndex);
+    event.preventDefault();
+  });
+});
+
+document.querySelectorAll(".th-menu-wrapper").forEach(wrapper => {
+  const dropdown = wrapper.querySelector(".th-dropdown");
+  if (!dropdown) return;
+
+  let hideTimeout;
+
+  const showDropdown = () => {
+    clearTimeout(hideTimeout);
+    dropdown.style.display = "block";
+  };
+
+  const hideDropdown = () => {
+    hideTimeout = setTimeout(() => {
+      dropdown.style.display = "none";
+    }, 400); //
+  };
+
+  wrapper.addEventListener("mouseenter", showDropdown);
+  wrapper.addEventListener("mouseleave", hideDropdown);
+  dropdown.addEventListener("mouseenter", showDropdown);
+  dropdown.addEventListener("mouseleave", hideDropdown);
+});
+
+
+
+
+(function () {
+  const isReallyMobile = () => {
+    const ua = navigator.userAgent;
+    const isMobileUA = /iPhone|iPad|iPod|Android|webOS|BlackBerry|IEMobile|Opera Mini/i.test(ua);
+    const isSmallScreen = window.innerWidth <= 768;
+    const isTouch = 'ontouchstart' in window || navigator.maxTouchPoints > 1;
+    return isMobileUA && isSmallScreen && isTouch;
+  };
+
+  if (isReallyMobile()) {
+    document.body.classList.add("mobile-compact");
+  }
+})();
+
+
+const button = document.getElementById("float-nav-button-container");
+
+if (button) {
+  const dropdown = document.querySelector(".nav_dropdown_container");
+  if (dropdown) {
+    dropdown.style.top = "0";
+    dropdown.style.right = "100%";
+    dropdown.style.left = "auto";
+  }
+}
+
+
+// Toggle main dropdown
+document.getElementById("float-nav-button-container")
+  .addEventListener("click", function () {
+    const dd = document.getElementById("nav-dropdown");
+    dd.style.display = dd.style.display === "block" ? "none" : "block";
+  });
+
+// Close dropdown on outside click
+document.addEventListener("click", function (e) {
+  const dd = document.getElementById("nav-dropdown");
+  const btn = document.getElementById("float-nav-button-container");
+  if (!dd.contains(e.target) && !btn.contains(e.target)) {
+    dd.style.display = "none";
+  }
+});
+
+// Wire up submenu hover handlers once DOM is ready
+document.addEventListener("DOMContentLoaded", () => {
+  document.querySelectorAll('.nav_category.has-children').forEach(cat => {
+    const sub = cat.querySelector('.nav_submenu');
+    if (!sub) return;
+    cat.addEventListener('mouseover',  () => sub.style.display = 'block');
+    cat.addEventListener('mouseleave', () => sub.style.display = 'none');
+  });
+});
+  const dropdownElem = document.getElementById("nav-dropdown");
+  dropdownElem.addEventListener('mouseleave', () => {
+    dropdownElem.style.display = 'none';
+  });
\ No newline at end of file
@@ -1,38 +1,67 @@
 const originalTableState = new Map();
 
+/**
+ * Clicking a cell hidden by its column reveals just that cell.
+ * A single delegated listener, so rows re-created by reset or shuffle need no rebinding.
+ */
 function attachCellClickListeners() {
-  document.querySelectorAll("td").forEach(cell => {
-    cell.addEventListener("click", () => {
-      cell.style.opacity = "";
-    });
+  if (attachCellClickListeners.bound) return;
+  attachCellClickListeners.bound = true;
+  document.addEventListener("click", event => {
+    const cell = event.target.closest("td[data-col]");
+    const table = cell && cell.closest("table");
+    if (table && table.classList.contains("hide-col-" + cell.dataset.col)) {
+      cell.classList.add("revealed");
+    }
   });
 }
 
 /**
- * Toggle visibility of a given column index across all tables
+ * Toggle visibility of a given column index across all tables.
+ * Only a hide-col-N class on each <table> changes; the page's generated
+ * #column-visibility stylesheet does the hiding.
  */
 function toggleColumn(colIndex) {
-  const cells = Array.from(document.querySelectorAll('td[data-col="' + colIndex + '"]'))
-    .filter(cell => !cell.closest("tr.row-divider"));
-  const currentlyHidden = cells.every(cell => cell.dataset.hidden === "true");
-  cells.forEach(cell => {
-    if (currentlyHidden) {
-      cell.style.opacity = "";
-      delete cell.dataset.hidden;
-    } else {
-      cell.style.opacity = "0";
-      cell.dataset.hidden = "true";
+  const className = "hide-col-" + colIndex;
+  const tables = Array.from(document.querySelectorAll("table[data-cols]"));
+  const currentlyHidden = tables.every(table => table.classList.contains(className));
+  tables.forEach(table => {
+    if (!currentlyHidden) {
+      table.querySelectorAll('td.revealed[data-col="' + colIndex + '"]').forEach(cell => cell.classList.remove("revealed"));
     }
+    table.classList.toggle(className, !currentlyHidden);
   });
 }
 
 /**
- * Reset visibility styles and restore original row order for all tables.
+ * Hide every column of every table (data-cols is the table's width, recorded at build time).
  */
-function resetColumns() {
-  document.querySelectorAll('td, th').forEach(cell => {
-    cell.style.opacity = '';
+function hideAllColumns() {
+  document.querySelectorAll("table[data-cols]").forEach(table => {
+    table.querySelectorAll("td.revealed").forEach(cell => cell.classList.remove("revealed"));
+    for (let col = 0; col < Number(table.dataset.cols); col++) {
+      table.classList.add("hide-col-" + col);
+    }
   });
+}
+
+/**
+ * Show every column again and forget revealed cells.
+ */
+function showAllColumns() {
+  document.querySelectorAll("table[data-cols]").forEach(table => {
+    Array.from(table.classList)
+      .filter(cls => /^hide-col-\d+$/.test(cls))
+      .forEach(cls => table.classList.remove(cls));
+    table.querySelectorAll("td.revealed").forEach(cell => cell.classList.remove("revealed"));
+  });
+}
+
+/**
+ * Reset column visibility and restore original row order for all tables.
+ */
+function resetColumns() {
+  showAllColumns();
 
   document.querySelectorAll("table").forEach((table, tableIndex) => {
     const tbodies = table.querySelectorAll("tbody");
@@ -123,13 +152,7 @@ function shuffleTableRows(table) {
         row.style.display = rowVisibilityMap.get(row);
       }
     });
-
-    // Reapply hidden column visibility after shuffle
-    document.querySelectorAll("td[data-col]").forEach(td => {
-      if (td.dataset.hidden === "true") {
-        td.style.opacity = "0";
-      }
-    });
+    // Hidden columns live on the table's classes, so they survive the shuffle as they are
   });
   attachCellClickListeners();
 }
@@ -190,53 +213,30 @@ document.addEventListener("DOMContentLoaded", () => {
 
   const hideAllBtn = document.getElementById("hide-all-button");
   if (hideAllBtn) {
-    hideAllBtn.addEventListener("click", () => {
-      document.querySelectorAll("tbody tr").forEach(row => {
-        if (
-          row.closest("tfoot") ||
-          row.classList.contains("section-divider") ||
-          (row.id && row.id.startsWith("section-"))
-        ) return;
-        row.querySelectorAll("td").forEach(td => {
-          td.style.opacity = "0";
-          td.dataset.hidden = "true";
-        });
-      });
-    });
+    hideAllBtn.addEventListener("click", hideAllColumns);
   }
 
-  // Wire up "Toggle Column" dropdown menu logic
-  const toggleColBtn = document.getElementById("toggle-col-button");
-  const toggleColMenu = document.getElementById("toggle-col-menu");
-
-  if (toggleColBtn && toggleColMenu) {
-    // Toggle dropdown visibility with dynamic rebuild
-    toggleColBtn.addEventListener("click", () => {
-      // Rebuild menu each time to ensure fresh DOM access
-      toggleColMenu.innerHTML = "";
-      const headerRow = document.querySelector("thead tr:nth-of-type(2)");
-      const headerCells = headerRow ? headerRow.querySelectorAll("th:not([colspan])") : [];
-
-      headerCells.forEach((th, index) => {
-        const colOption = document.createElement("div");
-        colOption.textContent = th.textContent || `Column ${index + 1}`;
-        colOption.style.padding = "4px 12px";
-        colOption.style.cursor = "pointer";
-        colOption.addEventListener("click", () => {
-          toggleColumn(index);
-          toggleColMenu.style.display = "none";
-        });
-        toggleColMenu.appendChild(colOption);
-      });
+  // Wire up the "Hide Column" dropdown; its entries are prebuilt from the table headers at build time
+  const hideColBtn = document.getElementById("hide-col-button");
+  const hideColMenu = document.getElementById("hide-col-menu");
+
+  if (hideColBtn && hideColMenu) {
+    hideColBtn.addEventListener("click", () => {
+      const isOpen = hideColMenu.style.display === "block";
+      hideColMenu.style.display = !isOpen && hideColMenu.querySelector(".col-option") ? "block" : "none";
+    });
 
-      // Show or hide the dropdown
-      toggleColMenu.style.display = toggleColMenu.childNodes.length > 0 ? "block" : "none";
+    hideColMenu.addEventListener("click", (e) => {
+      const option = e.target.closest(".col-option");
+      if (!option) return;
+      toggleColumn(option.dataset.col);
+      hideColMenu.style.display = "none";
     });
 
     // Hide dropdown when clicking outside
     document.addEventListener("click", (e) => {
-      if (!toggleColBtn.contains(e.target) && !toggleColMenu.contains(e.target)) {
-        toggleColMenu.style.display = "none";
+      if (!hideColBtn.contains(e.target) && !hideColMenu.contains(e.target)) {
+        hideColMenu.style.display = "none";
       }
     });
   }
@@ -1,5 +1,6 @@
-import json
 from pathlib import Path
+from utils.output_optimizer import compact_json
+from utils.build_metrics import METRICS
 
 def convert_buzzwords_to_json(
     input_path=Path("utils/Texts/buzzwords.txt"),
@@ -10,6 +11,7 @@ def convert_buzzwords_to_json(
 
     with input_path.open("r", encoding="utf-8") as f:
         for line in f:
+            METRICS.read(line)
             line = line.strip()
             if not line or "=" not in line:
                 continue
@@ -18,8 +20,10 @@ def convert_buzzwords_to_json(
             assoc = right.strip()
             buzzwords.append({"term": term, "assoc": assoc})
 
+    content = compact_json(buzzwords)
     with output_path.open("w", encoding="utf-8") as f:
-        json.dump(buzzwords, f, indent=2, ensure_ascii=False)
+        f.write(content)
+    METRICS.wrote(content)
 
     if verbose:
         print(f"✅ Converted {len(buzzwords)} buzzwords to JSON.")
\ No newline at end of file
@@ -0,0 +1,132 @@
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from utils.build_metrics import METRICS
+
+ROOT = Path(__file__).resolve().parents[1]
+ARTIFACT_HASHES_PATH = ROOT / "static" / "data" / ".artifact_hashes.json"
+
+# Encoded text is flushed to disk (and the hash) in blocks of about this many characters
+FLUSH_CHARS = 1 << 16
+# Same output as compact_json()
+COMPACT = {"ensure_ascii": False, "separators": (",", ":")}
+
+"""
+Streaming writer for large generated JSON artifacts (search index, stats, manifests).
+JSON is encoded piece by piece into a temp file next to the target while being hashed, so
+the full document never exists as one string. The digest is compared with the one recorded
+for the target at its last write (the old file is only re-read when that record is missing
+or the file was changed by something else), and the temp file atomically replaces the
+target only when the content changed.
+"""
+
+
+class ArtifactHashes:
+    """sha256, size and mtime of each artifact as this module last wrote it, shared by concurrent stages."""
+
+    def __init__(self, path: Path = ARTIFACT_HASHES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._records = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self._records = {}
+
+    @staticmethod
+    def key(path: Path) -> str:
+        path = path.resolve()
+        return path.relative_to(ROOT).as_posix() if path.is_relative_to(ROOT) else str(path)
+
+    def current(self, path: Path):
+        """Recorded digest of the file at path, or None if unknown or the file changed since it was recorded."""
+        with self._lock:
+            record = self._records.get(self.key(path))
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        if record is None or [st.st_size, st.st_mtime_ns] != [record["size"], record["mtime_ns"]]:
+            return None
+        return record["sha256"]
+
+    def record(self, path: Path, digest: str):
+        st = path.stat()
+        with self._lock:
+            self._records[self.key(path)] = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._records, indent=1, sort_keys=True), encoding="utf-8")
+
+
+HASHES = ArtifactHashes()
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_chunks(path: Path, chunks, hashes: ArtifactHashes = HASHES) -> bool:
+    """Stream text chunks to path atomically; returns True if the file changed."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    h = hashlib.sha256()
+    size = 0
+    # Same directory, so the rename is atomic; opened normally so the file gets the usual permissions
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            pending, pending_chars = [], 0
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_chars += len(chunk)
+                if pending_chars >= FLUSH_CHARS:
+                    data = "".join(pending).encode("utf-8")
+                    f.write(data)
+                    h.update(data)
+                    size += len(data)
+                    pending, pending_chars = [], 0
+            data = "".join(pending).encode("utf-8")
+            f.write(data)
+            h.update(data)
+            size += len(data)
+        digest = h.hexdigest()
+
+        old = hashes.current(path)
+        if old is None and path.exists():
+            old = _file_digest(path)  # First write through this module, or edited elsewhere
+        if old == digest:
+            tmp.unlink()
+            if hashes.current(path) is None:
+                hashes.record(path, digest)
+            return False
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    hashes.record(path, digest)
+    METRICS.count("bytes_written", size)
+    return True
+
+
+def write_json(path: Path, data, hashes: ArtifactHashes = HASHES, **dump_options) -> bool:
+    """Write data as JSON (json.dumps options, compact by default) without building the whole string."""
+    options = dump_options or COMPACT
+    return write_chunks(path, json.JSONEncoder(**options).iterencode(data), hashes)
+
+
+def write_json_array(path: Path, entries, hashes: ArtifactHashes = HASHES) -> bool:
+    """Write an iterable of entries as a compact JSON array, encoding one entry at a time."""
+    encode = json.JSONEncoder(**COMPACT).encode
+
+    def chunks():
+        yield "["
+        for i, entry in enumerate(entries):
+            yield "," + encode(entry) if i else encode(entry)
+        yield "]"
+
+    return write_chunks(path, chunks(), hashes)
@@ -0,0 +1,90 @@
+import os
+import re
+import shutil
+import hashlib
+from pathlib import Path
+from utils.output_optimizer import compact_json
+
+ROOT = Path(__file__).resolve().parents[1]
+ASSET_MANIFEST_PATH = ROOT / "static" / "data" / "asset-manifest.json"
+SITE_PREFIX = os.getenv("SITE_PREFIX", "/study_tables/")
+
+# Source assets referenced by the page and index templates
+ASSET_GLOBS = ["styles/*.css", "static/table_css/*.css", "java/*.js"]
+HASH_LENGTH = 8
+
+# name.<hash8>.ext — a fingerprinted copy written by this module
+_FINGERPRINTED = re.compile(rf"^(?P<stem>.+)\.[0-9a-f]{{{HASH_LENGTH}}}(?P<suffix>\.[^.]+)$")
+
+"""
+Content-fingerprinted copies of the CSS and JS assets (styles/style.css → styles/style.<hash8>.css),
+so they can be served with immutable, long-lived cache headers. The asset manifest maps each
+source path to its current copy; rewrite_asset_urls() points generated HTML at the copies, and
+copies superseded by a newer fingerprint are deleted.
+"""
+
+
+def fingerprinted_name(path: Path, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def is_fingerprinted_copy(path: Path) -> bool:
+    return bool(_FINGERPRINTED.match(path.name))
+
+
+def _source_assets(root: Path) -> list[Path]:
+    sources = set()
+    for pattern in ASSET_GLOBS:
+        sources.update(p for p in root.glob(pattern) if p.is_file() and not is_fingerprinted_copy(p))
+    return sorted(sources)
+
+
+def fingerprint_assets(root: Path = ROOT, manifest_path: Path = ASSET_MANIFEST_PATH) -> dict[str, str]:
+    """Copy every asset to its fingerprinted name, write the manifest, delete stale copies; returns source → copy paths."""
+    manifest = {}
+    created = 0
+    for source in _source_assets(root):
+        target = source.with_name(fingerprinted_name(source, source.read_bytes()))
+        if not target.exists():
+            shutil.copyfile(source, target)
+            created += 1
+        manifest[source.relative_to(root).as_posix()] = target.relative_to(root).as_posix()
+
+    # Garbage-collect copies of known sources that the manifest no longer points to
+    current = set(manifest.values())
+    removed = 0
+    for pattern in ASSET_GLOBS:
+        for path in root.glob(pattern):
+            m = _FINGERPRINTED.match(path.name)
+            if not m or path.relative_to(root).as_posix() in current:
+                continue
+            source = path.with_name(m["stem"] + m["suffix"]).relative_to(root).as_posix()
+            if source in manifest or not (root / source).exists():
+                path.unlink()
+                removed += 1
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    content = compact_json(manifest)
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != content:
+        manifest_path.write_text(content, encoding="utf-8")
+    if created or removed:
+        print(f"🔖 Asset fingerprints: {created} new, {removed} stale removed ({manifest_path.name})")
+    return manifest
+
+
+def rewrite_asset_urls(html: str, manifest: dict[str, str], prefix: str = SITE_PREFIX) -> str:
+    """Point every {prefix}<source> URL in the HTML at its fingerprinted copy."""
+    if not manifest:
+        return html
+    pattern = re.compile(
+        r"(?<=[\"'(])" + re.escape(prefix)
+        + "(" + "|".join(re.escape(src) for src in sorted(manifest, key=len, reverse=True)) + ")"
+        + r"(?=[\"'?#)])"
+    )
+    return pattern.sub(lambda m: prefix + manifest[m.group(1)], html)
+
+
+if __name__ == "__main__":
+    for source, copy in fingerprint_assets().items():
+        print(f"{source} → {copy}")
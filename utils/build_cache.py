@@ -0,0 +1,102 @@
+import os, json, hashlib
+from pathlib import Path
+from utils.page_helpers.parsers import parser_name
+from utils.search_helpers.data_banks import OVERUSED_WORDS, SHARED_ROW_LABELS
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / os.getenv("BUILD_CACHE_DIR", "static/data/.build_cache")
+
+# Everything a cached per-table output can depend on besides the table source itself.
+# Builder modules are included so a code change invalidates stale entries on its own.
+DEPENDENCY_PATHS = [
+    os.getenv("BASE_HTML", "static/BASE.html"),
+    "styles/style.css",
+    "styles/table.css",
+    "styles/nav.css",
+    "java/static_search.js",
+    "java/table_page_utils.js",
+    "assets/wordlist.txt",
+    "assets/ontologies/hpo_terms.json",
+    "utils/search_helpers/loader.py",
+    "utils/search_helpers/stopwords.py",
+    "utils/search_helpers/compact_index.py",
+    "utils/search_helpers/synonym_matcher.py",
+    "utils/search_helpers/lexicon.py",
+    "utils/page_helpers/html_utils.py",
+    "utils/page_helpers/nav_builder.py",
+    "utils/page_helpers/parsers.py",
+    "utils/page_builder.py",
+    "utils/static_search.py",
+    "utils/write_stats.py",
+    "utils/build_context.py",
+    "utils/build_cache.py",
+    "utils/output_optimizer.py",
+]
+
+"""Module for the content-addressed per-table build cache: rendered page, terms, stats partial and summary-card flag."""
+
+
+def data_banks_digest() -> str:
+    """
+    Hash of the data-bank values the term extractor uses, as imported at startup. data_banks.py
+    itself is regenerated by write_them_stats, possibly mid-build, so its bytes are not a stable key.
+    """
+    banks = [sorted(OVERUSED_WORDS), sorted(SHARED_ROW_LABELS)]
+    return hashlib.sha256(json.dumps(banks, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def dependency_fingerprint(table_names: list[str]) -> str:
+    """
+    Hash the template, assets, term-extraction data and builder code, plus the table catalog
+    (every page's nav lists every other table, so adding or renaming one touches all pages)
+    and the selected HTML parser backends.
+    """
+    h = hashlib.sha256()
+    for rel in DEPENDENCY_PATHS:
+        path = ROOT / rel
+        h.update(rel.encode("utf-8"))
+        h.update(path.read_bytes() if path.exists() else b"<missing>")
+    h.update(data_banks_digest().encode("utf-8"))
+    h.update("\n".join(sorted(table_names)).encode("utf-8"))
+    h.update(f"{parser_name()}|{parser_name(readonly=True)}".encode("utf-8"))
+    return h.hexdigest()
+
+
+class BuildCache:
+    """
+    Per-table outputs stored as static/data/.build_cache/<key>.json, where the key hashes
+    the table source together with the dependency fingerprint. A hit lets every stage
+    skip parsing that table; entries not used by the latest build are removed on save.
+    """
+
+    def __init__(self, fingerprint: str, cache_dir: Path = CACHE_DIR):
+        self.fingerprint = fingerprint
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, name: str, source_html: str) -> str:
+        # The file name is part of the key because the page label and slug derive from it
+        return hashlib.sha256("\0".join([self.fingerprint, name, source_html]).encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> dict:
+        path = self.cache_dir / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return {}
+        self.hits += 1
+        return entry
+
+    def save(self, entries: dict[str, dict]):
+        """Write the given key → entry map and drop every entry file not in it."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for key, entry in entries.items():
+            path = self.cache_dir / f"{key}.json"
+            content = json.dumps(entry, ensure_ascii=False)
+            if not path.exists() or path.read_text(encoding="utf-8") != content:
+                path.write_text(content, encoding="utf-8")
+        for stale in self.cache_dir.glob("*.json"):
+            if stale.stem not in entries:
+                stale.unlink()
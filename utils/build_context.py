@@ -0,0 +1,173 @@
+import os
+from pathlib import Path
+from bs4 import BeautifulSoup
+from utils.page_helpers.parsers import make_soup
+from utils.page_helpers.html_utils import generate_label_and_slug, prepare_page_soup, table_cells
+from utils.build_cache import BuildCache, dependency_fingerprint
+from utils.build_metrics import METRICS
+
+ROOT = Path(__file__).resolve().parents[1]
+TABLE_DIR = ROOT / os.getenv("TABLE_DIR", "subdex")
+TABLE_SUFFIX = ".table.html"
+_UNSET = object()  # For fields where None is a computed value
+
+"""Module holding the per-build state shared by every stage, so each source table is read and parsed only once."""
+
+
+class TableDocument:
+    """
+    One source table file, parsed at most once per build and not at all on a cache hit.
+    The soup stays pristine until it is annotated in place for the page; after that, the
+    tables and text extracted from it are exactly what ends up on the built page.
+    """
+
+    def __init__(self, path: Path, cache: BuildCache = None):
+        self.path = path
+        self.name = path.name
+        self.label, self.slug = generate_label_and_slug(path.name)
+        self.page_name = f"{self.slug}.html"
+        self.source_html = path.read_text()
+        self.annotated = False
+        self._soup = None
+        self._tables = None
+        self._cells = None
+
+        # Per-table outputs, filled from the build cache or by the stage that computes them
+        self.cache_key = cache.key_for(self.name, self.source_html) if cache is not None else None
+        entry = cache.load(self.cache_key) if cache is not None else {}
+        self.cache_hit = bool(entry)
+        self.apply_entry(entry)
+
+    def apply_entry(self, entry: dict):
+        """Adopt per-table outputs from a cache entry or a build worker."""
+        self.page_html = entry.get("page_html")
+        self.stats_partial = entry.get("stats")
+        self.table_terms = [set(terms) for terms in entry["table_terms"]] if "table_terms" in entry else None
+        self.term_cells = entry.get("term_cells")
+        self._page_text = entry.get("page_text")
+        self._summary_card = entry.get("summary_card")
+        self._description = entry.get("description", _UNSET)
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = make_soup(self.source_html)
+            METRICS.count("files_parsed")
+        return self._soup
+
+    def pristine_soup(self) -> BeautifulSoup:
+        """Return the unannotated tree, re-parsing the source only if annotation already ran."""
+        if self.annotated:
+            METRICS.count("files_parsed")
+            return make_soup(self.source_html, readonly=True)
+        return self.soup
+
+    def annotate(self) -> BeautifulSoup:
+        """Apply the page transforms to the soup (once) and return it."""
+        if not self.annotated:
+            prepare_page_soup(self.soup)
+            self.annotated = True
+        return self.soup
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            self._tables = self.annotate().find_all("table")
+        return self._tables
+
+    @property
+    def cells(self) -> list[list[tuple[str, str]]]:
+        """(cell id, text) of the body cells of each table on the page, pulled out once for term extraction."""
+        if self._cells is None:
+            self._cells = [table_cells(t) for t in self.tables]
+        return self._cells
+
+    @property
+    def page_text(self) -> str:
+        """Lowercased text of every table on the page, as used for synonym lookups."""
+        if self._page_text is None:
+            self._page_text = " ".join(t.get_text(separator=" ", strip=True).lower() for t in self.tables)
+        return self._page_text
+
+    @property
+    def summary_card(self) -> bool:
+        if self._summary_card is None:
+            meta = self.soup.find("meta", attrs={"name": "summary-card"})
+            self._summary_card = bool(meta and meta.get("content", "").lower() == "true")
+        return self._summary_card
+
+    @property
+    def description(self):
+        """Card description from the table's <meta name="description">, or None."""
+        if self._description is _UNSET:
+            meta = self.soup.find("meta", attrs={"name": "description"})
+            content = meta.get("content", "").strip() if meta else ""
+            self._description = content or None
+        return self._description
+
+    def cache_entry(self) -> dict:
+        """Everything known about this table so far, in build cache form."""
+        entry = {"source": self.name}
+        if self.page_html is not None:
+            entry["page_html"] = self.page_html
+        if self.stats_partial is not None:
+            entry["stats"] = self.stats_partial
+        if self.table_terms is not None:
+            entry["table_terms"] = [sorted(terms) for terms in self.table_terms]
+        if self.term_cells is not None:
+            entry["term_cells"] = self.term_cells
+        if self._page_text is not None:
+            entry["page_text"] = self._page_text
+        if self._summary_card is not None:
+            entry["summary_card"] = self._summary_card
+        if self._description is not _UNSET:
+            entry["description"] = self._description
+        return entry
+
+
+class BuildContext:
+    """
+    Shared state for a single build run.
+    Stages take the context instead of globbing and re-parsing files themselves,
+    and store their results on it so later stages never redo the work.
+    """
+
+    def __init__(self, table_dir: Path = TABLE_DIR, use_cache: bool = True):
+        self.table_dir = table_dir
+        table_files = sorted(f for f in table_dir.glob("*") if f.name.endswith(TABLE_SUFFIX))
+        self.cache = BuildCache(dependency_fingerprint([f.name for f in table_files])) if use_cache else None
+        self.documents = [TableDocument(f, self.cache) for f in table_files]
+        self.stats = None
+        self.search_index = None
+        self._loading_counted = False
+
+    def count_loading(self):
+        """
+        Charge reading the table sources and the build cache lookups to the calling stage. Loading
+        happens when the context is created, before any stage runs, so the first stage to use the
+        context (normally build_pages) reports it, once.
+        """
+        if self._loading_counted:
+            return
+        self._loading_counted = True
+        for doc in self.documents:
+            METRICS.read(doc.source_html)
+            if self.cache is not None:
+                METRICS.count("cache_hits" if doc.cache_hit else "cache_misses")
+
+    def save_cache(self):
+        """Persist per-table outputs gathered during this build and drop superseded entries."""
+        if self.cache is None:
+            return
+        self.cache.save({doc.cache_key: doc.cache_entry() for doc in self.documents})
+        print(f"🗃️  Build cache: {self.cache.hits} hit(s), {self.cache.misses} miss(es)")
+
+    @property
+    def table_files(self) -> list[Path]:
+        return [doc.path for doc in self.documents]
+
+    def document_for_page(self, page_name: str):
+        for doc in self.documents:
+            if doc.page_name == page_name:
+                return doc
+        return None
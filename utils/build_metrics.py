@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import cProfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from contextlib import contextmanager
+
+ROOT = Path(__file__).resolve().parents[1]
+SUMMARY_PATH = ROOT / "build_summary.json"
+PROFILE_DIR = ROOT / os.getenv("PROFILE_DIR", "build_profiles")
+
+# Counters every stage reports (zero when the stage does not touch them)
+COUNTERS = ["files_parsed", "bytes_read", "bytes_written", "cache_hits", "cache_misses", "terms"]
+
+"""
+Lightweight build instrumentation. Update_Directory runs each stage inside METRICS.stage(),
+which records wall and CPU time; code anywhere below it bumps the counters of whichever
+stage is running, and the totals are merged into build_summary.json. Stages named in
+METRICS.profile are also run under cProfile, with the stats dumped to PROFILE_DIR.
+"""
+
+
+def _cpu_seconds() -> float:
+    # This thread's CPU, so concurrently running stages don't count each other; children are
+    # included so process-pool work shows up once the pool has shut down
+    t = os.times()
+    return time.thread_time() + t.children_user + t.children_system
+
+
+def _size(content) -> int:
+    return len(content.encode("utf-8")) if isinstance(content, str) else len(content)
+
+
+def update_build_summary(fields: dict, path: Path = SUMMARY_PATH):
+    """Merge fields into build_summary.json, so the stages that write it don't overwrite each other."""
+    try:
+        summary = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        summary = {}
+    summary.update(fields)
+    summary["updated"] = datetime.now().isoformat()
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+class BuildMetrics:
+    """Per-stage timings and counters for one build run."""
+
+    def __init__(self):
+        self.stages = {}
+        self.profile = set()  # Stage names to profile; "*" profiles every stage
+        self._local = threading.local()  # Counters of the stage running on each thread
+
+    def count(self, counter: str, amount: int = 1):
+        current = getattr(self._local, "counters", None)
+        if current is not None:
+            current[counter] += amount
+
+    def read(self, content):
+        self.count("bytes_read", _size(content))
+
+    def wrote(self, content):
+        self.count("bytes_written", _size(content))
+
+    @contextmanager
+    def stage(self, name: str):
+        if getattr(self._local, "counters", None) is not None:
+            yield  # A stage called from inside another one counts towards the outer stage
+            return
+        counters = self._local.counters = dict.fromkeys(COUNTERS, 0)
+        profiler = cProfile.Profile() if {name, "*"} & self.profile else None
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            self.stages[name] = {
+                "wall_s": round(time.perf_counter() - wall, 4),
+                "cpu_s": round(_cpu_seconds() - cpu, 4),
+                **counters,
+            }
+            self._local.counters = None
+            if profiler:
+                PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+                profile_path = PROFILE_DIR / f"{name}.pstats"
+                profiler.dump_stats(profile_path)
+                print(f"🔬 Profile for {name} written to {profile_path} (python -m pstats {profile_path})")
+
+    def skip(self, name: str):
+        """Record a stage the scheduler skipped because its inputs and outputs were unchanged."""
+        self.stages[name] = {"wall_s": 0.0, "cpu_s": 0.0, **dict.fromkeys(COUNTERS, 0), "skipped": True}
+
+    def totals(self) -> dict:
+        return {key: round(sum(s[key] for s in self.stages.values()), 4) for key in ["wall_s", "cpu_s", *COUNTERS]}
+
+    def report(self):
+        for name, s in self.stages.items():
+            if s.get("skipped"):
+                print(f"⏭️  {name}: skipped (inputs unchanged)")
+                continue
+            print(f"⏱️  {name}: {s['wall_s']:.2f}s wall, {s['cpu_s']:.2f}s CPU, {s['files_parsed']} parsed, "
+                  f"{s['bytes_read']:,} B read, {s['bytes_written']:,} B written, "
+                  f"{s['cache_hits']}/{s['cache_misses']} cache hit/miss, {s['terms']} terms")
+
+    def write_summary(self, path: Path = SUMMARY_PATH, **fields):
+        update_build_summary({"stages": self.stages, "total": self.totals(), **fields}, path)
+
+
+METRICS = BuildMetrics()
@@ -0,0 +1,178 @@
+import os
+import re
+import gzip
+import json
+import hashlib
+from pathlib import Path
+from utils.build_metrics import METRICS
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz siblings are written
+    brotli = None
+
+ROOT = Path(__file__).resolve().parents[1]
+HASHES_PATH = ROOT / "static" / "data" / ".compressed_hashes.json"
+
+# Everything the static host serves that is worth precompressing
+COMPRESS_GLOBS = [
+    "index.html",
+    "pages/*.html",
+    "static/data/*.json",
+    "assets/search_index.json",
+    "assets/search_index/*.json",
+    "styles/*.css",
+    "static/table_css/*.css",
+    "java/*.js",
+]
+MIN_COMPRESS_BYTES = int(os.getenv("MIN_COMPRESS_BYTES", "256"))
+SIBLING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+# Whitespace inside these is significant: raw text, preformatted text, and table cells (white-space: pre-wrap in table.css)
+_RAW_TEXT_TAGS = {"script", "style"}
+_PRESERVE_TAGS = {"pre", "textarea", "td", "th"}
+_TOKEN = re.compile(r"<!--.*?-->|<![^>]*>|<(/?)([a-zA-Z][\w-]*)[^>]*>|[^<]+|<", re.S)
+_WHITESPACE = re.compile(r"\s+")
+
+"""
+Output optimization: minify_html() collapses insignificant whitespace and comments in
+generated HTML, compact_json() is the serializer for JSON the site downloads, and
+precompress_outputs() writes .gz (and, with the brotli package, .br) siblings of every
+served file, skipping files whose content hash is unchanged since the last run.
+"""
+
+
+def _collapse(match) -> str:
+    return "\n" if "\n" in match.group() else " "
+
+
+def minify_html(html: str) -> str:
+    """Collapse whitespace runs and drop comments outside <pre>, <textarea>, <script>, <style> and table cells."""
+    out = []
+    text = []  # Collapsible text since the last kept token; a dropped comment must not split a whitespace run
+    preserve_depth = 0
+    pos = 0
+
+    def emit(token):
+        if text:
+            out.append(_WHITESPACE.sub(_collapse, "".join(text)))
+            text.clear()
+        out.append(token)
+
+    while pos < len(html):
+        m = _TOKEN.match(html, pos)
+        token = m.group()
+        pos = m.end()
+        closing, tag = m.group(1), (m.group(2) or "").lower()
+
+        if token.startswith("<!--"):
+            if preserve_depth or token.startswith("<!--[if"):
+                emit(token)
+        elif tag in _RAW_TEXT_TAGS and not closing:
+            # Copy the element body verbatim; it may hold "<" that is not markup
+            end = re.compile(rf"</{tag}\s*>", re.I).search(html, pos)
+            stop = end.end() if end else len(html)
+            emit(token + html[pos:stop])
+            pos = stop
+        elif tag:
+            if tag in _PRESERVE_TAGS and not token.endswith("/>"):
+                preserve_depth = max(0, preserve_depth - 1) if closing else preserve_depth + 1
+            emit(token)
+        elif preserve_depth or token.startswith("<"):
+            emit(token)
+        else:
+            text.append(token)
+    emit("")
+    return "".join(out)
+
+
+def compact_json(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _output_files(root: Path) -> list[Path]:
+    files = set()
+    for pattern in COMPRESS_GLOBS:
+        files.update(p for p in root.glob(pattern) if p.is_file() and not p.name.startswith("."))
+    return sorted(files)
+
+
+def _siblings(path: Path) -> dict[str, Path]:
+    return {enc: path.with_name(path.name + suffix) for enc, suffix in SIBLING_SUFFIXES.items()}
+
+
+def _encoders() -> dict:
+    encoders = {"gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders["br"] = lambda data: brotli.compress(data, quality=11)
+    return encoders
+
+
+def precompress_outputs(root: Path = ROOT, hashes_path: Path = HASHES_PATH) -> dict:
+    """
+    Write precompressed siblings for every served file and return byte totals.
+    A sibling is only kept when it is smaller than the file itself; files whose
+    hash and siblings are unchanged since the last run are not recompressed.
+    """
+    encoders = _encoders()
+    try:
+        previous = json.loads(hashes_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        previous = {}
+
+    records = {}
+    report = {"files": 0, "compressed": 0, "unchanged": 0, "raw_bytes": 0, "gzip_bytes": 0, "br_bytes": 0}
+    for path in _output_files(root):
+        rel = path.relative_to(root).as_posix()
+        data = path.read_bytes()
+        METRICS.read(data)
+        digest = hashlib.sha256(data).hexdigest()
+        siblings = _siblings(path)
+        report["files"] += 1
+        report["raw_bytes"] += len(data)
+
+        old = previous.get(rel, {})
+        if (old.get("sha256") == digest and set(encoders) <= set(old.get("tried", []))
+                and all(siblings[enc].exists() for enc in old.get("sizes", {}))):
+            records[rel] = old
+            report["unchanged"] += 1
+        else:
+            sizes = {}
+            for enc, sibling in siblings.items():
+                encode = encoders.get(enc)
+                encoded = encode(data) if encode and len(data) >= MIN_COMPRESS_BYTES else data
+                if len(encoded) < len(data):
+                    sibling.write_bytes(encoded)
+                    METRICS.wrote(encoded)
+                    sizes[enc] = len(encoded)
+                elif sibling.exists():
+                    sibling.unlink()  # Stale, or not worth serving because the raw file is smaller
+            records[rel] = {"sha256": digest, "tried": sorted(encoders), "sizes": sizes}
+            report["compressed"] += 1
+
+        sizes = records[rel]["sizes"]
+        report["gzip_bytes"] += sizes.get("gzip", len(data))
+        report["br_bytes"] += sizes.get("br", len(data))
+
+    # Siblings of files that no longer exist
+    for rel in previous.keys() - records.keys():
+        for sibling in _siblings(root / rel).values():
+            if sibling.exists():
+                sibling.unlink()
+
+    hashes_path.parent.mkdir(parents=True, exist_ok=True)
+    content = json.dumps(records, indent=1, sort_keys=True)
+    if not hashes_path.exists() or hashes_path.read_text(encoding="utf-8") != content:
+        hashes_path.write_text(content, encoding="utf-8")
+
+    line = f"🗜️  Precompressed {report['files']} files ({report['unchanged']} unchanged): {report['raw_bytes']:,} B → gzip {report['gzip_bytes']:,} B"
+    if brotli is not None:
+        line += f", brotli {report['br_bytes']:,} B"
+    else:
+        line += " (install brotli for .br files)"
+    print(line)
+    return report
+
+
+if __name__ == "__main__":
+    precompress_outputs()
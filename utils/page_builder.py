@@ -1,15 +1,22 @@
 import sys, json, hashlib, os
-from datetime import datetime
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 load_dotenv()
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from bs4 import BeautifulSoup
-from utils.write_stats import write_them_stats
-from utils.page_helpers.nav_builder import generate_drop_nav_html
-from utils.page_helpers.html_utils import annotate_table_columns, generate_nav_html, extract_rr_associations_html, generate_label_and_slug
+from utils.write_stats import document_stats_partial
+from utils.build_context import BuildContext, TableDocument
+from utils.page_helpers.nav_builder import NavCatalog, categorize, generate_drop_nav_html
+from utils.page_helpers.html_utils import card_description, column_visibility_css, column_menu_html
+from utils.static_search import extract_page_terms
+from utils.page_helpers.parsers import soup_html
+from utils.output_optimizer import minify_html
+from utils.asset_fingerprint import fingerprint_assets, rewrite_asset_urls
+from utils.artifact_writer import write_json
+from utils.build_metrics import METRICS, update_build_summary
 
 TABLE_DIR = ROOT / os.getenv("TABLE_DIR", "subdex")
 OUTPUT_DIR = ROOT / os.getenv("OUTPUT_DIR", "pages")
@@ -18,6 +25,9 @@ BASE_HTML_PATH = ROOT / os.getenv("BASE_HTML", "static/BASE.html")
 MANIFEST_PATH = ROOT / os.getenv("MANIFEST_PATH", "static/data/table.manifest.json")
 
 BASE_HASH_PATH = ROOT / "static" / "data" / ".base_hash.json"
+BUILD_JOBS = int(os.getenv("BUILD_JOBS", "1"))
+# Pages embed their nav directly; the per-table nav files under NAV_DIR are only written on request
+WRITE_NAV_FILES = os.getenv("WRITE_NAV_FILES", "0") == "1"
 TABLE_SUFFIX = ".table.html"
 
 """Module to update HTML pages by processing table files, annotating columns for toggling, generating navigation bars, and building a manifest."""
@@ -26,19 +36,70 @@ def write_if_changed(path: Path, content: str):
     if path.exists() and path.read_text(encoding="utf-8") == content:
         return False
     path.write_text(content, encoding="utf-8")
+    METRICS.wrote(content)
     return True
 
 
 
-def build_pages():
+def render_page(doc: TableDocument, base_html: str, nav: NavCatalog):
+    """
+    Render one table's page and nav entry onto its document.
+    This is the independent per-table part of build_pages, run serially or in a worker.
+    """
+    # Stats need the unannotated tree, so take them before the page transforms run
+    document_stats_partial(doc)
+
+    # Annotate columns, drop row-divider rows and insert rapid review associations
+    table_html = soup_html(doc.annotate())
+
+    # Categorized drop nav from the shared, once-rendered fragment
+    drop_nav_html = nav.drop_nav_html(doc.slug)
+
+    # Compose final HTML by replacing placeholders in base template; the column toggle
+    # stylesheet and Hide Column menu are generated from the annotated tables
+    doc.page_html = minify_html(
+        base_html
+        .replace("{{PAGE_TITLE}}", doc.label)
+        .replace("{{COLUMN_CSS}}", column_visibility_css(doc.tables))
+        .replace("{{COLUMN_MENU}}", column_menu_html(doc.tables))
+        .replace("{{TABLE_CONTENT}}", table_html)
+        .replace("{{DROP_NAV_CONTENT}}", drop_nav_html)
+    )
+    # Record the home-page card fields while the tree is at hand
+    doc.summary_card
+    doc.description
+
+
+def _render_page_worker(table_file: Path, base_html: str, nav: NavCatalog) -> dict:
+    """Process-pool entry point: render one table and return its outputs as a cache entry."""
+    doc = TableDocument(table_file)
+    render_page(doc, base_html, nav)
+    # The annotated tree can't travel back to the parent, so take what search indexing needs here
+    extract_page_terms(doc)
+    doc.page_text
+    return doc.cache_entry()
+
+
+def build_pages(ctx: BuildContext = None, jobs: int = BUILD_JOBS, write_nav_files: bool = WRITE_NAV_FILES):
     """
     Main function to build all HTML pages from table files.
     Processes tables, annotates columns for toggling, generates navigation bars,
     writes output HTML files, and updates the manifest.
+    Each table is parsed once through the shared build context; the annotated
+    trees stay on the context for search indexing and the home page.
+    With jobs > 1 (0 = one per CPU) tables that need rendering are spread over a
+    process pool; results are merged in table order, so output matches a serial build.
+    The table catalog is categorized and its nav rendered once for all pages;
+    write_nav_files also writes the per-table nav files under NAV_DIR.
+    Stats are merged from the per-table partials taken here by write_them_stats, a stage of its own.
     """
-    # Ensure output and navigation directories exist
+    owns_ctx = ctx is None
+    if owns_ctx:
+        ctx = BuildContext(TABLE_DIR)
+    ctx.count_loading()
+
+    # Ensure output directory exists
     OUTPUT_DIR.mkdir(exist_ok=True)
-    NAV_DIR.mkdir(parents=True, exist_ok=True)
 
     manifest = []
     card_manifest = []
@@ -69,76 +130,68 @@ def build_pages():
     else:
         force_rebuild = True
 
-    # Gather all table files to process
-    table_files_all = sorted(TABLE_DIR.glob("*"))
-    table_files = [f for f in table_files_all if f.name.endswith(TABLE_SUFFIX)]
-
-    # Generate all drop navs once
-    generate_drop_nav_html()
-
-    # Loop over each table file to build individual pages
-    for table_file in table_files:
-        label, slug = generate_label_and_slug(table_file.name)
-
-        table_html_raw = table_file.read_text()
-        soup = BeautifulSoup(table_html_raw, "html.parser")
-
-        # Annotate table columns and insert toggle buttons
-        annotate_table_columns(soup)
-
-        # Remove row-divider rows and insert rapid review associations if present
-        for tr in soup.find_all("tr", class_="row-divider"):
-            tr.decompose()
+    # Fingerprinted asset copies; pages are rewritten to them when written (cached pages keep plain URLs)
+    asset_manifest = fingerprint_assets()
 
-        rapid_associations = soup.find_all("div", class_="rr-assoc")
-        if rapid_associations:
-            html_snippets = [str(div) for div in rapid_associations]
-            rr_html = extract_rr_associations_html(html_snippets)
-            new_rr = BeautifulSoup(rr_html, "html.parser")
-            soup.body.insert(0, new_rr)
-
-        table_html = str(soup)
+    # Gather all table files to process
+    table_files = ctx.table_files
+
+    # Cache hits already carry the rendered page; only misses are parsed
+    pending = [doc for doc in ctx.documents if doc.page_html is None]
+
+    # Label, slug and category of every table, and the shared nav fragment, computed once
+    nav = NavCatalog(table_files)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(pending) > 1:
+        worker = partial(_render_page_worker, base_html=base_html, nav=nav)
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for doc, entry in zip(pending, pool.map(worker, [doc.path for doc in pending], chunksize=chunksize)):
+                print(f"📄 Processing: {doc.name}")
+                doc.apply_entry(entry)
+                # Parsed and term-extracted in the worker, whose counters don't reach this process; its
+                # source was already counted by count_loading, so bytes_read matches a serial build
+                METRICS.count("files_parsed")
+                METRICS.count("terms", len(doc.term_cells))
+    else:
+        for doc in pending:
+            print(f"📄 Processing: {doc.name}")
+            render_page(doc, base_html, nav)
 
-        print(f"📄 Processing: {table_file.name}")
+    if write_nav_files:
+        NAV_DIR.mkdir(parents=True, exist_ok=True)
+        generate_drop_nav_html(nav_dir=NAV_DIR, catalog=nav)
 
-        # Build improved navigation bar with Home and links to other pages
-        nav_html = generate_nav_html(table_file, table_files)
+    # Loop over each table file to write individual pages
+    for doc in ctx.documents:
+        label, slug = doc.label, doc.slug
 
         # Write navigation HTML to separate file for potential reuse
-        nav_path = NAV_DIR / f"nav_{slug}.html"
-        write_if_changed(nav_path, nav_html)
-
-        # Load corresponding drop nav HTML
-        drop_nav_path = NAV_DIR / "drop_navs" / f"drop_nav_{slug}.html"
-        drop_nav_html = drop_nav_path.read_text() if drop_nav_path.exists() else ""
-
-        # Compose final HTML by replacing placeholders in base template
-        final_html = (
-            base_html
-            .replace("{{PAGE_TITLE}}", label)
-            .replace("{{TABLE_CONTENT}}", table_html)
-            .replace("{{DROP_NAV_CONTENT}}", drop_nav_html)
-        )
+        if write_nav_files:
+            write_if_changed(NAV_DIR / f"nav_{slug}.html", nav.nav_html(doc.name))
 
         # Write the generated HTML page to output directory
         output_file = OUTPUT_DIR / f"{slug}.html"
-        if force_rebuild or write_if_changed(output_file, final_html):
+        if write_if_changed(output_file, rewrite_asset_urls(doc.page_html, asset_manifest)) or force_rebuild:
             print(f"📄 Built page: {output_file.name}")
 
-        # Append page info to manifest list
-        manifest.append({
-            "name": label,
-            "file": f"{slug}.html"
-        })
-
-        card_manifest.append({
+        # Append page info to the manifest: everything the home page needs, so it never opens a page
+        entry = {
             "name": label,
             "file": f"{slug}.html",
-            "desc": f"A summary table for {label.lower()}."  # Placeholder, can be customized later
-        })
+            "category": categorize(slug),
+            "summary_card": doc.summary_card,
+            "desc": card_description(label, doc.description),
+            "rows": doc.stats_partial["total_rows"],
+            "terms": len(set().union(*extract_page_terms(doc))),
+        }
+        manifest.append(entry)
+        if entry["summary_card"]:
+            card_manifest.append(entry)
 
     # Cleanup orphaned HTML files
-    expected_files = {f"{generate_label_and_slug(f.name)[1]}.html" for f in table_files}
+    expected_files = {doc.page_name for doc in ctx.documents}
     actual_files = {f.name for f in OUTPUT_DIR.glob("*.html")}
     for file in actual_files - expected_files:
         orphan = OUTPUT_DIR / file
@@ -148,21 +201,19 @@ def build_pages():
     # Ensure manifest parent directories exist
     MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
     # Write the manifest JSON file with all pages info
-    write_if_changed(MANIFEST_PATH, json.dumps(manifest, indent=2))
+    write_json(MANIFEST_PATH, manifest)
     BASE_HASH_PATH.write_text(json.dumps({"hash": full_base_hash}))
     print(f"\n🧾 Manifest updated: {MANIFEST_PATH}")
 
     card_manifest_path = Path("static/data/summary_cards.json")
     card_manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    write_if_changed(card_manifest_path, json.dumps(card_manifest, indent=2))
+    write_json(card_manifest_path, card_manifest)
     print(f"🧾 Summary cards written to: {card_manifest_path}")
 
-    # 🔁 Generate full stats (structure, spans, headers, etc.)
-    write_them_stats()
+    if owns_ctx:
+        ctx.save_cache()
 
-    summary = {
-        "updated": datetime.now().isoformat(),
+    update_build_summary({
         "pages_built": [f.name for f in table_files],
         "manifest_count": len(manifest)
-    }
-    Path("build_summary.json").write_text(json.dumps(summary, indent=2))
+    })
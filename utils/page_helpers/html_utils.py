@@ -1,6 +1,6 @@
-TABLES_WITH_TOGGLE = {"table1", "table2", "table3"}
-
+import html
 from bs4 import BeautifulSoup
+from utils.page_helpers.parsers import make_fragment
 from pathlib import Path
 
 
@@ -42,6 +42,25 @@ def generate_label_and_slug(filename: str) -> tuple[str, str]:
     slug = label.lower().replace(" ", "-")
     return label, slug
 
+# Home-page card descriptions for tables whose source has no <meta name="description">
+CARD_DESCRIPTIONS = {
+    "Metabolism": "Includes glycolysis, glycogen storage, and fatty acid oxidation disorders",
+    "Hemeonc": "Summarizes hematologic malignancies, anemias, and blood-related findings",
+    "Chromosomes": "Genetic disorders and syndromes organized by chromosome number",
+    "Autoantibodies": "Autoimmune diseases and their associated antibodies",
+    "Glossary": "Relevant terms across pathology, genetics, and neuro — clearly explained with examples",
+    "Lab Tests": "lab tests for diagnosis and management, including tumor markers, infection assays, and metabolic workups",
+    "Associations": "Rapid-fire 'most common' and exam associations",
+    "Presentations": "Clinical buzzwords and presentation patterns linked to classic diagnoses — optimized for fast recall",
+    "Findings": "Diagnostic clues and lab/physical findings tied to conditions, covering exam associations",
+    "Pharm": "Work in progress, but go crazy with these Antibiotics and Immunologics"
+}
+
+
+def card_description(label: str, description: str = None) -> str:
+    """Description for a table's card: its own meta description, a known one, or a placeholder."""
+    return description or CARD_DESCRIPTIONS.get(label, f"A summary table for {label.lower()}.")
+
 # is safe, but if someone hardcoded label = "CD Markers" without sanitizing the input, 
 # it could mismatch during category checks. You’re fine as-is given the current flow, but be aware if you ever decouple slug from label generation.
 
@@ -66,66 +85,142 @@ def extract_rr_associations_html(items):
 
 
 
+def cell_id(table_idx: int, row_idx: int, col_idx: int) -> str:
+    """Stable id of a body cell: its table's position on the page, its row's position in the table and its logical column."""
+    return f"cell-{table_idx}-{row_idx}-{col_idx}"
+
+
+def _span(cell, attr: str) -> int:
+    try:
+        return max(1, int(cell.get(attr, 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def logical_columns(rows) -> list[list[int]]:
+    """
+    Logical column of every cell, row by row, from an occupancy grid that honors colspan and
+    rowspan: a cell starts at the first column of its row not covered by a rowspan from above.
+    Rowspans do not cross row groups (thead / tbody / tfoot), as in HTML table layout.
+    """
+    columns = []
+    covered = {}  # Logical column → rows still covered by a rowspan from an earlier row
+    group = None
+    for row in rows:
+        if row.parent is not group:
+            group, covered = row.parent, {}
+        occupied = {col for col, remaining in covered.items() if remaining > 0}
+        covered = {col: remaining - 1 for col, remaining in covered.items() if remaining > 1}
+
+        row_columns = []
+        col = 0
+        for cell in row.find_all(["td", "th"], recursive=False):
+            while col in occupied:
+                col += 1
+            row_columns.append(col)
+            colspan, rowspan = _span(cell, "colspan"), _span(cell, "rowspan")
+            if rowspan > 1:
+                for spanned in range(col, col + colspan):
+                    covered[spanned] = rowspan - 1
+            col += colspan
+        columns.append(row_columns)
+    return columns
+
+
+def _wrap_header(soup: BeautifulSoup, cell, col: int):
+    """Move the header's existing content into a column title span next to its toggle dropdown."""
+    label = soup.new_tag("span", **{"class": "col-title"})
+    label["data-title"] = cell.get_text(strip=True).lower()
+    for child in list(cell.contents):
+        label.append(child.extract())
+
+    dropdown = soup.new_tag("div", **{"class": "th-dropdown"})
+    action = soup.new_tag("a", href="#", onclick=f"toggleColumn({col}); return false;")
+    action["class"] = "col-toggle"
+    action["role"] = "button"
+    action["aria-label"] = "Toggle column visibility"
+    action["title"] = "Toggle this column"
+    action.string = "Toggle Hide"
+    dropdown.append(action)
+
+    menu = soup.new_tag("div", **{"class": "th-menu-wrapper"})
+    menu.append(label)
+    menu.append(dropdown)
+    cell.append(menu)
+
+
 def annotate_table_columns(soup: BeautifulSoup):
     """
-    Adds data-col attributes to <td> and <th> elements for column-based control.
-    Injects a dropdown toggle menu into <th> headers (excluding colspans).
+    Adds logical-column data-col attributes (colspan and rowspan aware) to <td> and <th> elements
+    for column-based control, and a stable cell id (see cell_id) to every body <td> for search
+    deep links. Injects a dropdown toggle menu into body <th> headers (excluding colspans), and
+    records each table's logical width as data-cols. Each table is walked once.
     """
     assigned_table_title = False
-    for row in soup.find_all("tr"):
-        if row.find_parent("thead") or row.find_parent("tfoot"):
-            continue  # Skip header and footer rows
-        # Apply .row-divider class to <td> with colspan outside thead and tfoot
-        if not row.find_parent("thead") and not row.find_parent("tfoot"):
-            for cell in row.find_all("td"):
-                if cell.has_attr("colspan"):
-                    existing_classes = cell.get("class", [])
-                    if "row-divider" not in existing_classes:
-                        cell["class"] = existing_classes + ["row-divider"]
-
-        if not assigned_table_title and row.find("th", colspan=True):
-            for cell in row.find_all("th"):
-                if cell.has_attr("colspan"):
-                    existing_classes = cell.get("class", [])
-                    if "table-title" not in existing_classes:
-                        cell["class"] = existing_classes + ["table-title"]
-            assigned_table_title = True
-
-        cells = row.find_all(["td", "th"])
-        for idx, cell in enumerate(cells):
-            cell["data-col"] = str(idx)
-
-            if cell.name == "th" and not cell.has_attr("colspan"):
-                clean_text = cell.get_text(strip=True)
-                original_content = cell.decode_contents()
-                cell.clear()
-
-                parent_table = cell.find_parent("table")
-                table_class = ""
-                if parent_table and parent_table.has_attr("class"):
-                    for cls in parent_table["class"]:
-                        if cls in TABLES_WITH_TOGGLE:
-                            table_class = cls
-                            break
-
-                menu = soup.new_tag("div", **{"class": "th-menu-wrapper"})
-                label = soup.new_tag("span", **{"class": "col-title"})
-                label["data-title"] = clean_text.lower()
-                label.append(BeautifulSoup(original_content, "html.parser"))
-
-                dropdown = soup.new_tag("div", **{"class": "th-dropdown"})
-                action = soup.new_tag("a", href="#", onclick=f"toggleColumn({idx}); return false;")
-                action["class"] = "col-toggle"
-                action["role"] = "button"
-                action["aria-label"] = "Toggle column visibility"
-                action["title"] = "Toggle this column"
-                action.string = "Toggle Hide"
-                dropdown.append(action)
-
-
-                menu.append(label)
-                menu.append(dropdown)
-                cell.append(menu)
+    for table_idx, table in enumerate(soup.find_all("table")):
+        # Only the table's own rows; a nested table is annotated on its own pass, against its own grid
+        rows = [row for row in table.find_all("tr") if row.find_parent("table") is table]
+        width = 0
+        for row_idx, (row, row_columns) in enumerate(zip(rows, logical_columns(rows))):
+            cells = row.find_all(["td", "th"], recursive=False)
+            for cell, col in zip(cells, row_columns):
+                cell["data-col"] = str(col)
+                width = max(width, col + _span(cell, "colspan"))
+            if row.parent.name in ("thead", "tfoot"):
+                continue  # Header and footer rows only get their columns
+
+            title_row = not assigned_table_title and any(c.name == "th" and c.has_attr("colspan") for c in cells)
+            for cell, col in zip(cells, row_columns):
+                classes = cell.get("class", [])
+                if cell.name == "td":
+                    # Colspan cells outside thead and tfoot divide the body into sections
+                    if cell.has_attr("colspan") and "row-divider" not in classes:
+                        cell["class"] = classes + ["row-divider"]
+                    if not cell.has_attr("id"):
+                        cell["id"] = cell_id(table_idx, row_idx, col)
+                elif cell.has_attr("colspan"):
+                    if title_row and "table-title" not in classes:
+                        cell["class"] = classes + ["table-title"]
+                else:
+                    _wrap_header(soup, cell, col)
+            assigned_table_title = assigned_table_title or title_row
+        table["data-cols"] = str(width)
+
+
+# Body cells a hide-col-N class on their table hides; clicking a hidden cell marks it .revealed.
+# Full-width section dividers start in column 0 but belong to no single column, so they stay visible.
+# Body rows sit in a <tbody> or, when the source has none (html.parser adds none), directly in the <table>
+_HIDDEN_ROW = 'tr:not(.section-divider):not([id^="section-"]) > td[data-col="{col}"]:not(.revealed):not(.row-divider)'
+_HIDDEN_COLUMN_CELLS = f"table.hide-col-{{col}} > {_HIDDEN_ROW},table.hide-col-{{col}} > tbody > {_HIDDEN_ROW}"
+
+
+def column_visibility_css(tables) -> str:
+    """
+    Generated <style> for the page's column toggles, sized to its widest table (data-cols):
+    hiding column N only adds hide-col-N to a <table>, so no cell is restyled from script.
+    """
+    width = max((int(t.get("data-cols", 0)) for t in tables), default=0)
+    if not width:
+        return ""
+    selectors = ",".join(_HIDDEN_COLUMN_CELLS.format(col=col) for col in range(width))
+    return f'<style id="column-visibility">{selectors}{{opacity:0}}</style>'
+
+
+def column_menu_html(tables) -> str:
+    """Hide Column menu entries, one per header of the first table's label row (the last <thead> row, colspans excluded)."""
+    for table in tables:
+        thead = table.find("thead")
+        rows = thead.find_all("tr") if thead else []
+        if not rows:
+            continue
+        items = []
+        for th in rows[-1].find_all("th", recursive=False):
+            if th.has_attr("colspan") or not th.has_attr("data-col"):
+                continue
+            label = html.escape(th.get_text(" ", strip=True), quote=False) or f"Column {int(th['data-col']) + 1}"
+            items.append(f'<div class="col-option" role="button" data-col="{th["data-col"]}">{label}</div>')
+        return "".join(items)
+    return ""
 
 
 # Navigation HTML utilities
@@ -149,6 +244,41 @@ def remove_row_dividers(soup: BeautifulSoup):
         tr.decompose()
 
 
+def table_cell_texts(table) -> list[str]:
+    """
+    Returns the text of every body cell (<td>) of a table, row by row.
+    """
+    return [cell.get_text(separator=" ", strip=True) for row in table.find_all("tr") for cell in row.find_all("td")]
+
+
+def table_cells(table) -> list[tuple[str, str]]:
+    """
+    Returns (cell id, text) for every body cell (<td>) of a table, row by row.
+    The id is None unless the table was annotated with annotate_table_columns.
+    """
+    return [(cell.get("id"), cell.get_text(separator=" ", strip=True)) for row in table.find_all("tr") for cell in row.find_all("td")]
+
+
+def prepare_page_soup(soup: BeautifulSoup):
+    """
+    Applies every in-place transform a source table gets before it is written as a page:
+    column annotation, row-divider removal and the rapid review carousel.
+    """
+    # Annotate table columns and insert toggle buttons
+    annotate_table_columns(soup)
+
+    # Remove row-divider rows and insert rapid review associations if present
+    remove_row_dividers(soup)
+
+    rapid_associations = soup.find_all("div", class_="rr-assoc")
+    if rapid_associations:
+        html_snippets = [str(div) for div in rapid_associations]
+        rr_html = extract_rr_associations_html(html_snippets)
+        new_rr = make_fragment(rr_html)
+        # Table sources are fragments; only a full document has a <body>
+        (soup.body or soup).insert(0, new_rr)
+
+
 
 
 
@@ -12,70 +12,92 @@ TABLE_SUFFIX = ".table.html"
 
 
 
-def generate_drop_nav_html():
+def categorize(slug: str) -> str:
+    if slug == "glossary":
+        return "Glossary"
+    elif any(x in slug for x in ["presentation", "finding", "associa"]):
+        return "Rapid Review"
+    elif any(x in slug for x in ["hla", "cytokine", "autoantibodies", "cd"]):
+        return "Immune"
+    elif any(x in slug for x in ["cardio", "respiratory", "embryo"]):
+        return "System"
+    elif any(x in slug for x in ["pharm"]):
+        return "Reference"
+    else:
+        return "Misc"
+
+
+class NavCatalog:
     """
-    Generates a categorized dropdown-style nav with grouped sections and writes one per table
-    into utils/navs/drop_navs/drop_nav_<slug>.html.
+    Every table's label, slug and category, worked out once per build, plus the navigation
+    fragments rendered once for all pages. Each page's own link is marked by its position in
+    the rendered fragment and left out when the fragment is requested for that page.
     """
-    drop_nav_dir = Path("utils/navs/drop_navs")
-    drop_nav_dir.mkdir(parents=True, exist_ok=True)
 
-    table_files = sorted(TABLE_DIR.glob(f"*{TABLE_SUFFIX}"))
-
-    def categorize(slug: str) -> str:
-        if slug == "glossary":
-            return "Glossary"
-        elif any(x in slug for x in ["presentation", "finding", "associa"]):
-            return "Rapid Review"
-        elif any(x in slug for x in ["hla", "cytokine", "autoantibodies", "cd"]):
-            return "Immune"
-        elif any(x in slug for x in ["cardio", "respiratory", "embryo"]):
-            return "System"
-        elif any(x in slug for x in ["pharm"]):
-            return "Reference"
-        else:
-            return "Misc"
-
-    for table_file in table_files:
-        filename = table_file.name
-        label, slug = generate_label_and_slug(filename)
-
-        # Build category → links map
+    def __init__(self, table_files: list[Path]):
+        self.entries = []
+        for table_file in table_files:
+            label, slug = generate_label_and_slug(table_file.name)
+            self.entries.append((table_file.name, label, slug, categorize(slug)))
+        self._drop_parts, self._drop_marks = self._render_drop_nav()
+        self._flat_links = [
+            (name, f'<a href="../pages/{slug}.html" class="nav-link">{label}</a>')
+            for name, label, slug, _ in self.entries
+        ]
+
+    def _render_drop_nav(self):
         category_map = {}
-        category = categorize(slug)
-        category_map.setdefault(category, [])
-        for other_file in table_files:
-            other_label, other_slug = generate_label_and_slug(other_file.name)
-            if other_slug == slug:
-                continue  # ⛔ Skip linking to current page in its own nav
-            other_category = categorize(other_slug)
-            category_map.setdefault(other_category, []).append((other_label, other_slug))
+        for _, label, slug, category in self.entries:
+            category_map.setdefault(category, []).append((label, slug))
 
         # Build HTML with just the dropdown contents (not the outer nav wrapper)
-        nav_html = '    <div class="nav_dropdown_container" id="nav-dropdown">\n'
-
+        parts = ['    <div class="nav_dropdown_container" id="nav-dropdown">\n']
+        marks = {}  # slug → indices of the parts holding that page's links
         for category, links in sorted(category_map.items()):
             category_id = f"category-{category.lower().replace(' ', '-')}"
             if category.lower() == "glossary":
-                nav_html += f'      <!-- {category}: label (no direct link) -->\n'
-                nav_html += f'      <div class="nav_category" id="{category_id}">\n'
-                nav_html += f'        <a class="nav_category_link" href="../pages/glossary.html">{category}</a>\n'
-                nav_html += f'      </div>\n'
+                parts.append(f'      <!-- {category}: label (no direct link) -->\n'
+                             f'      <div class="nav_category" id="{category_id}">\n'
+                             f'        <a class="nav_category_link" href="../pages/glossary.html">{category}</a>\n'
+                             f'      </div>\n')
             else:
-                nav_html += f'      <!-- {category}: submenu -->\n'
-                nav_html += f'      <div class="nav_category has-children" id="{category_id}">\n'
-                nav_html += f'        <span>{category}</span>\n'
-                nav_html += f'        <div class="nav_submenu">\n'
+                parts.append(f'      <!-- {category}: submenu -->\n'
+                             f'      <div class="nav_category has-children" id="{category_id}">\n'
+                             f'        <span>{category}</span>\n'
+                             f'        <div class="nav_submenu">\n')
                 for label, link_slug in sorted(links):
-                    nav_html += f'          <a class="nav_link_tab" href="../pages/{link_slug}.html">{label}</a>\n'
-                nav_html += f'        </div>\n'
-                nav_html += f'      </div>\n'
-
-        nav_html += '    </div>\n'
-
+                    marks.setdefault(link_slug, set()).add(len(parts))
+                    parts.append(f'          <a class="nav_link_tab" href="../pages/{link_slug}.html">{label}</a>\n')
+                parts.append('        </div>\n'
+                             '      </div>\n')
+        parts.append('    </div>\n')
+        return parts, marks
+
+    def drop_nav_html(self, slug: str) -> str:
+        """Categorized dropdown nav for one page (⛔ without a link to the page itself)."""
+        skip = self._drop_marks.get(slug, ())
+        return "".join(part for i, part in enumerate(self._drop_parts) if i not in skip).strip()
+
+    def nav_html(self, file_name: str) -> str:
+        """Flat nav bar linking every other table, as generate_nav_html renders it."""
+        other_links = [link for name, link in self._flat_links if name != file_name]
+        centered_links = '<div style="text-align: center;">' + ' | '.join(other_links) + '</div>'
+        return f"<nav style='margin: 10px 0;'>\n{centered_links}\n</nav>\n"
+
+
+def generate_drop_nav_html(table_files: list[Path] = None, nav_dir: Path = NAV_DIR, catalog: NavCatalog = None):
+    """
+    Writes the categorized dropdown nav of every table to <nav_dir>/drop_navs/drop_nav_<slug>.html.
+    Pages no longer read these files; they are only written when WRITE_NAV_FILES is on (or when run directly).
+    """
+    if catalog is None:
+        catalog = NavCatalog(table_files if table_files is not None else sorted(TABLE_DIR.glob(f"*{TABLE_SUFFIX}")))
+    drop_nav_dir = nav_dir / "drop_navs"
+    drop_nav_dir.mkdir(parents=True, exist_ok=True)
+    for _, _, slug, _ in catalog.entries:
         output_path = drop_nav_dir / f"drop_nav_{slug}.html"
         with open(output_path, "w", encoding="utf-8") as f:
-            f.write(nav_html.strip())
+            f.write(catalog.drop_nav_html(slug))
 
 
 ################################################################################################
@@ -0,0 +1,75 @@
+import os
+import re
+import logging
+from bs4 import BeautifulSoup
+
+# Parser backends that build the same tree as html.parser for our tables (html5lib adds <tbody>, so it is left out)
+SUPPORTED_PARSERS = ("html.parser", "lxml")
+DEFAULT_PARSER = "html.parser"
+
+_DOCUMENT_TAG = re.compile(r"<html[\s>]", re.IGNORECASE)
+_warned = set()
+
+"""
+Single place that decides which BeautifulSoup backend each build stage uses.
+HTML_PARSER picks the backend for trees that get modified and written out (pages);
+HTML_PARSER_READONLY picks it for stages that only read (stats, term extraction,
+summary-card checks) and defaults to HTML_PARSER. Both can also be set with configure_parsers().
+"""
+
+
+def configure_parsers(page: str = None, readonly: str = None):
+    """Select backends for this process and any worker processes it starts."""
+    if page:
+        os.environ["HTML_PARSER"] = page
+    if readonly:
+        os.environ["HTML_PARSER_READONLY"] = readonly
+
+
+def parser_name(readonly: bool = False) -> str:
+    """Return the configured backend, falling back to html.parser if it is unknown or not installed."""
+    name = os.getenv("HTML_PARSER", DEFAULT_PARSER)
+    if readonly:
+        name = os.getenv("HTML_PARSER_READONLY", name)
+    if name not in SUPPORTED_PARSERS:
+        _warn_once(name, f"Unknown HTML parser '{name}', using {DEFAULT_PARSER}. Supported: {', '.join(SUPPORTED_PARSERS)}")
+        return DEFAULT_PARSER
+    if name == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            _warn_once(name, f"lxml is not installed, using {DEFAULT_PARSER}")
+            return DEFAULT_PARSER
+    return name
+
+
+def make_soup(markup: str, readonly: bool = False) -> BeautifulSoup:
+    """
+    Parse a table file or page with the configured backend.
+    C-backed parsers wrap fragments in <html>/<head>/<body>; the soup remembers that
+    so soup_html() can serialize it exactly like html.parser output.
+    """
+    name = parser_name(readonly)
+    soup = BeautifulSoup(markup, name)
+    soup.fragment_wrapped = name != "html.parser" and not _DOCUMENT_TAG.search(markup)
+    return soup
+
+
+def make_fragment(markup: str) -> BeautifulSoup:
+    """Parse a small snippet meant for insertion into another tree; always html.parser so no document wrapper is added."""
+    return BeautifulSoup(markup, "html.parser")
+
+
+def soup_html(soup: BeautifulSoup) -> str:
+    """Serialize a soup from make_soup() without any wrapper the parser added around a fragment."""
+    if not getattr(soup, "fragment_wrapped", False):
+        return str(soup)
+    head = soup.find("head")
+    body = soup.find("body")
+    return (head.decode_contents() if head else "") + (body.decode_contents() if body else "")
+
+
+def _warn_once(key: str, message: str):
+    if key not in _warned:
+        _warned.add(key)
+        logging.warning(message)
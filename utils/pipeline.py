@@ -0,0 +1,128 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.build_metrics import METRICS
+from utils.asset_fingerprint import is_fingerprinted_copy
+
+ROOT = Path(__file__).resolve().parents[1]
+STAGE_HASHES_PATH = ROOT / "static" / "data" / ".stage_hashes.json"
+STAGE_WORKERS = int(os.getenv("STAGE_WORKERS", "4"))
+
+"""
+Small DAG scheduler for the build. Each Stage names the stages it runs after and the files it
+reads and writes (globs relative to the project root). Stages run as soon as everything they
+depend on has finished, independent ones concurrently on a thread pool, and each at most once.
+A stage whose inputs and outputs hash the same as after its last successful run is skipped.
+"""
+
+
+class Stage:
+    """
+    One build step. `inputs` / `outputs` are globs whose contents decide whether the stage can be
+    skipped; `key` adds anything else its output depends on (e.g. CLI options). A stage without
+    inputs always runs.
+    """
+
+    def __init__(self, name: str, run, after=(), inputs=(), outputs=(), key: str = ""):
+        self.name = name
+        self.run = run
+        self.after = list(after)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.key = key
+
+
+def _files(patterns, root: Path) -> list[Path]:
+    files = set()
+    for pattern in patterns:
+        files.update(p for p in root.glob(pattern) if p.is_file() and not is_fingerprinted_copy(p))
+    return sorted(files)
+
+
+def files_digest(patterns, root: Path = ROOT, key: str = "") -> str:
+    """Hash of `key` and the names and contents of every file the globs match."""
+    h = hashlib.sha256(key.encode("utf-8"))
+    for path in _files(patterns, root):
+        h.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()
+
+
+def _ordered(stages: list[Stage]) -> list[Stage]:
+    """Validate the graph and return the stages in a dependency-respecting order."""
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("❌ Duplicate stage names in the build pipeline")
+    ordered, state = [], {}
+
+    def visit(stage, chain):
+        if state.get(stage.name) == "done":
+            return
+        if state.get(stage.name) == "visiting":
+            raise ValueError(f"❌ Stage dependency cycle: {' → '.join(chain + [stage.name])}")
+        state[stage.name] = "visiting"
+        for dep in stage.after:
+            if dep not in by_name:
+                raise ValueError(f"❌ Stage {stage.name} runs after unknown stage {dep}")
+            visit(by_name[dep], chain + [stage.name])
+        state[stage.name] = "done"
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage, [])
+    return ordered
+
+
+def run_stages(stages: list[Stage], force: bool = False, workers: int = STAGE_WORKERS,
+               root: Path = ROOT, hashes_path: Path = STAGE_HASHES_PATH) -> dict[str, str]:
+    """
+    Run every stage once, in dependency order, overlapping independent stages.
+    Returns stage name → "ran" / "skipped". The first failure stops further scheduling and is re-raised.
+    """
+    ordered = _ordered(stages)
+    try:
+        previous = json.loads(hashes_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        previous = {}
+    records = {name: record for name, record in previous.items() if name in {s.name for s in ordered}}
+
+    def execute(stage: Stage) -> str:
+        # Inputs are hashed when the stage becomes ready, so they include what upstream stages just wrote
+        if stage.inputs:
+            inputs = files_digest(stage.inputs, root, stage.key)
+            old = previous.get(stage.name, {})
+            if not force and old.get("inputs") == inputs and old.get("outputs") == files_digest(stage.outputs, root):
+                METRICS.skip(stage.name)
+                return "skipped"
+        with METRICS.stage(stage.name):
+            stage.run()
+        if stage.inputs:
+            records[stage.name] = {"inputs": inputs, "outputs": files_digest(stage.outputs, root)}
+        return "ran"
+
+    results = {}
+    pending = {s.name: s for s in ordered}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.after):
+                    running[pool.submit(execute, stage)] = name
+                    del pending[name]
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception:
+                    pending.clear()  # Let running stages finish, schedule nothing new
+                    wait(running)
+                    raise
+
+    hashes_path.parent.mkdir(parents=True, exist_ok=True)
+    content = json.dumps(records, indent=1, sort_keys=True)
+    if not hashes_path.exists() or hashes_path.read_text(encoding="utf-8") != content:
+        hashes_path.write_text(content, encoding="utf-8")
+    return results
@@ -0,0 +1,119 @@
+import re
+import json
+from pathlib import Path
+from utils.search_helpers.stopwords import ENGLISH_STOPWORDS
+from utils.build_metrics import METRICS
+
+COMPACT_INDEX_DIR = Path("assets/search_index")
+COMPACT_INDEX_VERSION = 2
+PREFIX_LENGTH = 2
+
+# A word starts after whitespace, "-", "/" or "(" — each start becomes a searchable key
+_WORD_START = re.compile(r"(?<=[\s\-/(])(?=[^\s\-/(])")
+_FIRST_WORD = re.compile(r"[^\s\-/(]+")
+
+"""
+Writes the client-side search index as a versioned, prefix-sharded layout:
+
+    assets/search_index/manifest.json   {"version", "prefix_length", "pages", "sections", "shards", "entries"}
+    assets/search_index/<hex>.json      [[term, page_idx, section_idx, medical, key_offset, cell], ...]
+
+Page and section strings are interned in the manifest. The term itself and every later
+word start that is not a stopword is a key (term[key_offset:]); rows are sharded by the
+first PREFIX_LENGTH characters of their key and sorted by key, so the browser fetches one
+shard per query prefix and binary-searches it. `cell` is the id of the first cell the term
+appears in without its "cell-" prefix (empty when unknown), so a result can link to #cell-<cell>.
+Offsets and sort order use UTF-16 code units to match JavaScript string semantics.
+"""
+
+
+def _utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def key_offsets(term: str) -> list[int]:
+    """Code-point offsets of the searchable word starts in a term, beginning with 0."""
+    offsets = [0]
+    for m in _WORD_START.finditer(term):
+        if _FIRST_WORD.match(term, m.start()).group() not in ENGLISH_STOPWORDS:
+            offsets.append(m.start())
+    return offsets
+
+
+def shard_file_name(prefix: str) -> str:
+    # Prefixes can hold "/", "." or non-ASCII characters, so name shards by their UTF-8 hex
+    return f"{prefix.encode('utf-8').hex()}.json"
+
+
+class CompactIndexBuilder:
+    """Collects shard rows one flat index entry at a time, so the entries can be streamed through it."""
+
+    def __init__(self):
+        self.pages, self.sections = {}, {}
+        self.shards: dict[str, list] = {}
+        self.entries = 0
+
+    def add(self, entry: dict):
+        page_idx = self.pages.setdefault(entry["page"], len(self.pages))
+        section_idx = self.sections.setdefault(entry["section"], len(self.sections))
+        term = entry["term"]
+        cells = entry.get("cells")
+        first_cell = cells[0].removeprefix("cell-") if cells else ""
+        for offset in key_offsets(term):
+            key = term[offset:]
+            row = [term, page_idx, section_idx, 1 if entry["medical"] else 0, _utf16_len(term[:offset]), first_cell]
+            self.shards.setdefault(key[:PREFIX_LENGTH], []).append((key.encode("utf-16-be"), row))
+        self.entries += 1
+
+    def build(self) -> tuple[dict, dict[str, list]]:
+        """(manifest, prefix → sorted shard rows) for everything added so far."""
+        shard_rows = {}
+        for prefix, keyed_rows in self.shards.items():
+            keyed_rows.sort(key=lambda kr: (kr[0], kr[1][1], kr[1][0]))
+            shard_rows[prefix] = [row for _, row in keyed_rows]
+
+        manifest = {
+            "version": COMPACT_INDEX_VERSION,
+            "prefix_length": PREFIX_LENGTH,
+            "pages": list(self.pages),
+            "sections": list(self.sections),
+            "shards": {
+                prefix: {"file": shard_file_name(prefix), "count": len(rows)}
+                for prefix, rows in sorted(shard_rows.items())
+            },
+            "entries": self.entries,
+        }
+        return manifest, shard_rows
+
+
+def build_compact_index(index) -> tuple[dict, dict[str, list]]:
+    """Turn flat index entries into (manifest, prefix → sorted shard rows)."""
+    builder = CompactIndexBuilder()
+    for entry in index:
+        builder.add(entry)
+    return builder.build()
+
+
+def write_compact_index(index, output_dir: Path = COMPACT_INDEX_DIR) -> dict:
+    """
+    Write shards, then the manifest, then remove shards the new manifest no longer lists.
+    `index` is the flat entries or a CompactIndexBuilder they were already streamed through.
+    """
+    manifest, shard_rows = index.build() if isinstance(index, CompactIndexBuilder) else build_compact_index(index)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for prefix, rows in shard_rows.items():
+        _write_if_changed(output_dir / shard_file_name(prefix), json.dumps(rows, ensure_ascii=False, separators=(",", ":")))
+    _write_if_changed(output_dir / "manifest.json", json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+
+    expected = {info["file"] for info in manifest["shards"].values()} | {"manifest.json"}
+    for stale in output_dir.glob("*.json"):
+        if stale.name not in expected:
+            stale.unlink()
+    return manifest
+
+
+def _write_if_changed(path: Path, content: str):
+    if not path.exists() or path.read_text(encoding="utf-8") != content:
+        path.write_text(content, encoding="utf-8")
+        METRICS.wrote(content)
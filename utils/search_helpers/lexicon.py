@@ -0,0 +1,150 @@
+import os
+import json
+import hashlib
+import mmap
+import struct
+import logging
+from pathlib import Path
+
+HP_JSON_PATH = Path("assets/ontologies/hpo_terms.json")
+WORDLIST_PATH = Path("assets/wordlist.txt")
+LEXICON_PATH = Path("assets/medical_lexicon.bin")
+
+# Header: magic, term count, padding, then the sha256 of the wordlist and HPO file contents
+MAGIC = b"STLEXv2\n"
+HEADER = struct.Struct("<8sII32s")
+OFFSET = struct.Struct("<I")
+
+"""
+Compact medical lexicon: the wordlist plus HPO labels and synonyms, lowercased, deduplicated
+and sorted by UTF-8 bytes into one binary file. Lookups binary-search a read-only mmap of it,
+so every process (including parallel build workers) shares the same pages instead of
+building its own set. The file is recompiled whenever a source file's content changes, and
+identical sources always compile to an identical file.
+
+Layout: HEADER | (count + 1) little-endian uint32 offsets | concatenated UTF-8 terms
+"""
+
+
+def _source_signature() -> bytes:
+    h = hashlib.sha256()
+    for path in (WORDLIST_PATH, HP_JSON_PATH):
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            h.update(b"\0missing")
+            continue
+        h.update(len(content).to_bytes(8, "little"))
+        h.update(content)
+    return h.digest()
+
+
+def _read_wordlist() -> set:
+    try:
+        return set(w.strip().lower() for w in WORDLIST_PATH.read_text(encoding="utf-8").splitlines() if w.strip())
+    except Exception as e:
+        logging.warning(f"Error loading wordlist: {e}")
+        return set()
+
+
+def _read_hpo_terms() -> set:
+    if not HP_JSON_PATH.exists():
+        return set()
+    try:
+        with open(HP_JSON_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        logging.warning(f"Error loading HP terms: {e}")
+        return set()
+    terms = set()
+    for entry in data:
+        if isinstance(entry.get("lbl"), str):
+            terms.add(entry["lbl"].lower())
+        for syn in entry.get("meta", {}).get("synonyms", []):
+            if isinstance(syn.get("val"), str):
+                terms.add(syn["val"].lower())
+    return terms
+
+
+def compile_lexicon(output_path: Path = LEXICON_PATH) -> int:
+    """Compile the wordlist and HPO terms into the binary lexicon; returns the number of terms."""
+    signature = _source_signature()
+    encoded = sorted(t.encode("utf-8") for t in _read_wordlist() | _read_hpo_terms())
+
+    offsets = bytearray()
+    position = 0
+    for term in encoded:
+        offsets += OFFSET.pack(position)
+        position += len(term)
+    offsets += OFFSET.pack(position)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(encoded), 0, signature))
+        f.write(offsets)
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, output_path)  # Atomic, so concurrent readers never see a partial file
+    return len(encoded)
+
+
+class MedicalLexicon:
+    """Read-only, mmap-backed sorted term list supporting `in`, len() and iteration."""
+
+    def __init__(self, path: Path = LEXICON_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self._count, _, self.signature = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a medical lexicon file")
+        except Exception:
+            self._mm.close()  # Don't leak the mapping of a file we can't use
+            raise
+        self._offsets = HEADER.size
+        self._blob = HEADER.size + (self._count + 1) * OFFSET.size
+
+    def close(self):
+        self._mm.close()
+
+    def _term(self, i: int) -> bytes:
+        start = OFFSET.unpack_from(self._mm, self._offsets + i * OFFSET.size)[0]
+        end = OFFSET.unpack_from(self._mm, self._offsets + (i + 1) * OFFSET.size)[0]
+        return self._mm[self._blob + start:self._blob + end]
+
+    def __contains__(self, term: str) -> bool:
+        key = term.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self._count and self._term(lo) == key
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._term(i).decode("utf-8")
+
+
+def open_lexicon(path: Path = LEXICON_PATH) -> MedicalLexicon:
+    """Open the lexicon, recompiling it first if it is missing or its sources changed."""
+    signature = _source_signature()
+    try:
+        lexicon = MedicalLexicon(path)
+        if lexicon.signature == signature:
+            return lexicon
+        lexicon.close()
+    except (FileNotFoundError, ValueError, struct.error):
+        pass
+    count = compile_lexicon(path)
+    print(f"📚 Medical lexicon compiled: {path} ({count} terms)")
+    return MedicalLexicon(path)
+
+
+if __name__ == "__main__":
+    print(f"✅ Medical lexicon written to {LEXICON_PATH} with {compile_lexicon()} terms")
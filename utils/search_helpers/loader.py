@@ -1,57 +1,34 @@
-import json
-import requests
 from pathlib import Path
 from functools import lru_cache
 import logging
+from utils.search_helpers.lexicon import open_lexicon, _read_hpo_terms, _read_wordlist
 
 HP_JSON_PATH = Path("assets/ontologies/hpo_terms.json")
 WORDLIST_PATH = Path("assets/wordlist.txt")
 SEARCH_INDEX_PATH = Path("assets/search_index.json")
 
-_all_terms = None
+_lexicon = None
 
 def load_hpo_terms():
-    try:
-        with open(HP_JSON_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            terms = set()
-            for entry in data:
-                if "lbl" in entry:
-                    terms.add(entry["lbl"].lower())
-                synonyms = entry.get("meta", {}).get("synonyms", [])
-                for syn in synonyms:
-                    if "val" in syn:
-                        terms.add(syn["val"].lower())
-            return terms
-    except Exception as e:
-        return set()
+    return _read_hpo_terms()
 
 def load_wordlist():
-    try:
-        return set(w.strip().lower() for w in WORDLIST_PATH.read_text(encoding="utf-8").splitlines() if w.strip())
-    except Exception:
-        return set()
+    return _read_wordlist()
 
-def get_all_medical_terms():
-    global _all_terms
-    if _all_terms is not None:
-        return _all_terms
-
-    _all_terms = set()
-    try:
-        _all_terms.update(load_hpo_terms())
-    except Exception as e:
-        logging.warning(f"Error loading HP terms: {e}")
+def get_lexicon():
+    """The compiled, mmap-backed medical lexicon (opened once per process)."""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = open_lexicon()
+    return _lexicon
 
-    try:
-        _all_terms.update(load_wordlist())
-    except Exception as e:
-        logging.warning(f"Error loading wordlist: {e}")
-
-    return _all_terms
+def get_all_medical_terms():
+    """Materialize the lexicon as a set; prefer get_lexicon() or is_medical_term() for lookups."""
+    return set(get_lexicon())
 
+@lru_cache(maxsize=65536)
 def is_medical_term(word: str) -> bool:
-    return word.lower() in get_all_medical_terms()
+    return word.lower() in get_lexicon()
 
 def is_medical_phrase(phrase: str) -> bool:
-    return any(is_medical_term(w) for w in phrase.split())
\ No newline at end of file
+    return any(is_medical_term(w) for w in phrase.split())
@@ -0,0 +1,188 @@
+import re
+import json
+import math
+import bisect
+import time
+import threading
+from pathlib import Path
+from collections import Counter, OrderedDict, defaultdict
+from utils.page_helpers.parsers import make_soup
+from utils.page_helpers.html_utils import table_cells
+
+ROOT = Path(__file__).resolve().parents[2]
+SEARCH_INDEX_PATH = ROOT / "assets/search_index.json"
+PAGES_DIR = ROOT / "pages"
+
+# Same ordering the browser search uses (java/static_search.js)
+PAGE_RANK = {"glossary": 1, "triads": 2, "associations": 3, "labs": 4, "pharm": 5}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MEDICAL_BOOST = 0.5
+PAGE_RANK_BOOST = 0.5
+TERM_BOOST = 1.0          # An indexed term is a better hit than the same words in a cell
+PREFIX_WEIGHT = 0.5       # Completions of the last, still-being-typed query word
+MAX_PREFIX_EXPANSIONS = 20
+SNIPPET_LENGTH = 160
+RELOAD_CHECK_INTERVAL = 2.0  # Seconds between staleness checks, which stat every built page
+
+_TOKEN = re.compile(r"\w+")
+
+"""
+In-memory ranked search over the generated search index and the body cells of the built
+pages: an inverted index scored with BM25 plus boosts for medical terms and ranked pages,
+an LRU cache of recent queries, and an automatic reload whenever search_index.json or a built
+page changes. Each reload publishes a new immutable IndexSnapshot, so searches never see a half-built index.
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class IndexSnapshot:
+    """One immutable build of the index; a reload publishes a new snapshot instead of mutating this one."""
+
+    def __init__(self, docs: list[dict], generation: int):
+        postings = defaultdict(dict)
+        lengths = []
+        for doc_id, doc in enumerate(docs):
+            tokens = tokenize(doc["text"])
+            lengths.append(len(tokens))
+            for token, tf in Counter(tokens).items():
+                postings[token][doc_id] = tf
+
+        self.generation = generation
+        self.docs = docs
+        self.postings = dict(postings)
+        self.vocabulary = sorted(postings)
+        self.doc_lengths = lengths
+        self.avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    def expand(self, token: str) -> list[str]:
+        start = bisect.bisect_left(self.vocabulary, token)
+        matches = []
+        for word in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS + 1]:
+            if not word.startswith(token):
+                break
+            if word != token:
+                matches.append(word)
+        return matches[:MAX_PREFIX_EXPANSIONS]
+
+    def score(self, query_tokens: list[str]) -> Counter:
+        n = len(self.docs)
+        weighted = [(token, 1.0) for token in query_tokens]
+        if query_tokens:
+            weighted += [(word, PREFIX_WEIGHT) for word in self.expand(query_tokens[-1])]
+
+        scores = Counter()
+        for token, weight in weighted:
+            doc_tfs = self.postings.get(token)
+            if not doc_tfs:
+                continue
+            idf = math.log(1 + (n - len(doc_tfs) + 0.5) / (len(doc_tfs) + 0.5))
+            for doc_id, tf in doc_tfs.items():
+                norm = 1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / (self.avg_length or 1)
+                scores[doc_id] += weight * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        return scores
+
+
+class SearchEngine:
+    def __init__(self, index_path: Path = SEARCH_INDEX_PATH, pages_dir: Path = PAGES_DIR, cache_size: int = 256):
+        self.index_path = index_path
+        self.pages_dir = pages_dir
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # (query, limit) → (generation, results)
+        self._loaded_signature = None
+        self._next_check = 0.0
+        self.snapshot = IndexSnapshot([], generation=0)
+
+    def _load_docs(self) -> list[dict]:
+        docs = []
+        for entry in json.loads(self.index_path.read_text(encoding="utf-8")):
+            cells = entry.get("cells") or [None]
+            docs.append({"kind": "term", "text": entry["term"], "page": entry["page"], "cell": cells[0],
+                         "section": entry["section"], "medical": entry.get("medical", False)})
+        for page in sorted(self.pages_dir.glob("*.html")):
+            section = page.stem.replace("-", " ").title()
+            soup = make_soup(page.read_text(encoding="utf-8"), readonly=True)
+            for table in soup.find_all("table"):
+                for cell_id, text in table_cells(table):
+                    if text:
+                        docs.append({"kind": "cell", "text": text, "page": page.name, "cell": cell_id,
+                                     "section": section, "medical": False})
+        return docs
+
+    def _signature(self):
+        """What the index is built from: search_index.json plus every built page (cells come from the pages)."""
+        try:
+            index_mtime = self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        pages = sorted((p.name, p.stat().st_mtime_ns) for p in self.pages_dir.glob("*.html"))
+        return index_mtime, tuple(pages)
+
+    def ensure_loaded(self):
+        """
+        (Re)build the index if search_index.json or any built page is new or changed since the last load.
+        Checked at most once per RELOAD_CHECK_INTERVAL, so queries don't stat the pages every time.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + RELOAD_CHECK_INTERVAL
+        signature = self._signature()
+        if signature is None or signature == self._loaded_signature:
+            return
+        with self._lock:
+            if signature != self._loaded_signature:
+                # Built off to the side, then published with one assignment; searches keep the snapshot they started with
+                snapshot = IndexSnapshot(self._load_docs(), self.snapshot.generation + 1)
+                self.snapshot = snapshot
+                self._cache.clear()
+                self._loaded_signature = signature
+
+    def _boost(self, doc: dict) -> float:
+        boost = TERM_BOOST if doc["kind"] == "term" else 0.0
+        if doc["medical"]:
+            boost += MEDICAL_BOOST
+        rank = PAGE_RANK.get(doc["page"].replace(".html", ""))
+        if rank:
+            boost += PAGE_RANK_BOOST * (len(PAGE_RANK) + 1 - rank) / len(PAGE_RANK)
+        return boost
+
+    def search(self, query: str, limit: int = 15) -> list[dict]:
+        self.ensure_loaded()
+        snapshot = self.snapshot  # One reference for the whole query, even if a reload publishes a new one
+        key = (query.strip().lower(), limit)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == snapshot.generation:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        scores = snapshot.score(tokenize(key[0]))
+        ranked = sorted(((score + self._boost(snapshot.docs[i]), i) for i, score in scores.items()),
+                        key=lambda pair: (-pair[0], pair[1]))
+
+        results, seen = [], set()
+        for score, doc_id in ranked:
+            doc = snapshot.docs[doc_id]
+            dedup = (doc["text"], doc["page"])
+            if dedup in seen:
+                continue
+            seen.add(dedup)
+            text = doc["text"] if len(doc["text"]) <= SNIPPET_LENGTH else doc["text"][:SNIPPET_LENGTH - 1] + "…"
+            results.append({"kind": doc["kind"], "text": text, "page": doc["page"], "cell": doc["cell"],
+                            "section": doc["section"], "medical": doc["medical"], "score": round(score, 4)})
+            if len(results) >= limit:
+                break
+
+        with self._lock:
+            # Results computed on an index that has since been replaced are returned but not cached
+            if snapshot.generation == self.snapshot.generation:
+                self._cache[key] = (snapshot.generation, results)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return results
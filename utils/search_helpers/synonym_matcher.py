@@ -0,0 +1,67 @@
+from collections import deque
+
+"""
+Aho-Corasick multi-pattern matcher. The automaton is built once from every pattern (here, all
+HPO synonyms) and finds all of them in a single left-to-right pass over a text, instead of one
+substring scan per pattern. Matches are plain substrings, the same as `pattern in text`.
+"""
+
+
+class SynonymMatcher:
+    """Trie over the patterns with failure links; each state lists every pattern ending there."""
+
+    def __init__(self, patterns):
+        self.patterns = sorted(set(p for p in patterns if p))
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for i, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = (i,)
+
+        # Breadth-first from the depth-1 states (which fail to the root), so a state's failure
+        # target, always shallower, is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                # Longest proper suffix of the child's string that is also a trie state
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] += self._out[self._fail[child]]
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def find_all(self, text: str) -> list[tuple[int, str]]:
+        """Every (start offset, pattern) occurrence in text, overlapping ones included, by end offset."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        hits = []
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for i in out[state]:
+                hits.append((pos - len(patterns[i]) + 1, patterns[i]))
+        return hits
+
+    def matches(self, text: str) -> dict[str, list[int]]:
+        """Pattern → start offsets of its occurrences in text, for the patterns that occur."""
+        found = {}
+        for start, pattern in self.find_all(text):
+            found.setdefault(pattern, []).append(start)
+        return found
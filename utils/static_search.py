@@ -1,52 +1,103 @@
+import os
 import json
-from bs4 import BeautifulSoup
 from pathlib import Path
-from datetime import datetime
 import re
-from nltk.corpus import stopwords
-from collections import defaultdict, Counter
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from utils.search_helpers.data_banks import OVERUSED_WORDS, SHARED_ROW_LABELS
-from utils.search_helpers.loader import is_medical_term, is_medical_phrase, get_all_medical_terms
+from utils.search_helpers.stopwords import ENGLISH_STOPWORDS
+from utils.page_helpers.parsers import make_soup
+from utils.page_helpers.html_utils import table_cell_texts, table_cells
+from utils.artifact_writer import write_json_array
+from utils.search_helpers.compact_index import write_compact_index, CompactIndexBuilder, COMPACT_INDEX_DIR
+from utils.search_helpers.loader import is_medical_term, is_medical_phrase, get_lexicon
+from utils.search_helpers.synonym_matcher import SynonymMatcher
+from utils.build_metrics import METRICS
 
-with open("assets/ontologies/hpo_terms.json", "r", encoding="utf-8") as f:
-    HPO_SYNONYMS = {
-        v["lbl"].lower(): set(s["val"].lower() for s in v.get("meta", {}).get("synonyms", []) if isinstance(s.get("val"), str))
-        for v in json.load(f)
-        if "lbl" in v and "meta" in v and "synonyms" in v["meta"]
-    }
+HP_JSON_PATH = Path("assets/ontologies/hpo_terms.json")
+STOPWORDS = ENGLISH_STOPWORDS
 
+_hpo_synonyms = None
+_synonym_matcher = None
 
-MEDICAL_TERMS = get_all_medical_terms()
-# Ensure NLTK stopwords are available
-try:
-    STOPWORDS = set(stopwords.words("english"))
-except LookupError:
-    import nltk
-    nltk.download("stopwords")
-    STOPWORDS = set(stopwords.words("english"))
+
+def get_hpo_synonyms():
+    """HPO label → synonyms map, loaded on first use (empty when the ontology file is absent)."""
+    global _hpo_synonyms
+    if _hpo_synonyms is None:
+        if HP_JSON_PATH.exists():
+            with open(HP_JSON_PATH, "r", encoding="utf-8") as f:
+                _hpo_synonyms = {
+                    v["lbl"].lower(): set(s["val"].lower() for s in v.get("meta", {}).get("synonyms", []) if isinstance(s.get("val"), str))
+                    for v in json.load(f)
+                    if "lbl" in v and "meta" in v and "synonyms" in v["meta"]
+                }
+        else:
+            _hpo_synonyms = {}
+    return _hpo_synonyms
+
+
+def get_synonym_matcher():
+    """Aho-Corasick automaton over every HPO synonym, built once and reused for every page."""
+    global _synonym_matcher
+    if _synonym_matcher is None:
+        _synonym_matcher = SynonymMatcher(s for synonyms in get_hpo_synonyms().values() for s in synonyms)
+    return _synonym_matcher
+
+
+def __getattr__(name):
+    # HPO_SYNONYMS and MEDICAL_TERMS used to be loaded at import; keep them reachable, lazily
+    if name == "HPO_SYNONYMS":
+        return get_hpo_synonyms()
+    if name == "MEDICAL_TERMS":
+        return get_lexicon()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Configurable paths
 PAGES_DIR = Path("pages")
 OUTPUT_FILE = Path("assets/search_index.json")
+# Worker processes for parsing built pages in standalone runs (0 = one per CPU)
+INDEX_JOBS = int(os.getenv("INDEX_JOBS", os.getenv("BUILD_JOBS", "1")))
+# A term on more pages than this is too common to be worth indexing
+MAX_TERM_PAGES = 5
 
-def extract_terms_from_table(table):
-    BAD_WORDS = {
+# Patterns used by the term extractor, compiled once
+_WHITESPACE = re.compile(r"\s+")
+_CHUNK_SPLIT = re.compile(r"[;•·\u2022,\n]")
+_SUBPHRASE_SPLIT = re.compile(r"[()]| - ")
+_CODE_PATTERN = re.compile(r"\b(c\d+|q\d+|p\d+|cd\d+|hba\d+|il-\d+|22q\d+)\b")
+_JUNK_PATTERN = re.compile(r"(the|of|with|and|for|to|in|on|a)+")
+
+
+class TermExtractor:
+    """
+    Extracts searchable terms from table cell text.
+    Each cell is split in a single pass that yields its subphrases together with
+    their adjacent-pair recombinations, and the keep/drop decision for a phrase is
+    memoized, since the same phrases repeat across rows, tables and pages.
+    """
+
+    BAD_WORDS = frozenset({
         "syndrome", "disease", "disorder", "defect", "condition", "abnormality", "problem"
-    }
+    })
 
-    def _is_medical_phrase_local(phrase):
-        if len(phrase.split()) > 8:
-            return False
-        if any(char.isdigit() for char in phrase) or re.search(r"(c\d+|q\d+|hba\d|t\d+)", phrase):
-            return True
-        return False
+    def __init__(self, stopwords=None, overused_words=None, shared_row_labels=None, medical_term=None):
+        self.stopwords = STOPWORDS if stopwords is None else stopwords
+        self.overused_words = OVERUSED_WORDS if overused_words is None else overused_words
+        self.shared_row_labels = SHARED_ROW_LABELS if shared_row_labels is None else shared_row_labels
+        self.medical_term = is_medical_term if medical_term is None else medical_term
+        self._decisions = {}
 
-    def score_phrase(phrase):
-        words = phrase.split()
+    @staticmethod
+    def _is_medical_phrase_local(phrase, words):
+        # Every code pattern (c7, q22, hba1, t4) contains a digit, so the digit test covers them
+        return len(words) <= 8 and any(char.isdigit() for char in phrase)
+
+    def score_phrase(self, phrase, words):
         score = 0
         if len(phrase) >= 15:
             score += 1
-        if re.search(r"\b(c\d+|q\d+|p\d+|cd\d+|hba\d+|il-\d+|22q\d+)\b", phrase):
+        if _CODE_PATTERN.search(phrase):
             score += 2
         if any(char.isdigit() for char in phrase):
             score += 1
@@ -54,105 +105,222 @@ def extract_terms_from_table(table):
             score += 1
         if len(words) >= 2:
             score += 1
-        stopword_ratio = sum(1 for w in words if w in STOPWORDS) / len(words)
+        stopword_ratio = sum(1 for w in words if w in self.stopwords) / len(words)
         if stopword_ratio > 0.5:
             score -= 1
-        if _is_medical_phrase_local(phrase):
+        if self._is_medical_phrase_local(phrase, words):
             score += 2
         return max(score, 0)
 
+    @staticmethod
     def looks_like_junk(phrase):
         # Skip sequences like "of the", "in a", etc.
-        return bool(re.fullmatch(r"(the|of|with|and|for|to|in|on|a)+", phrase.replace(" ", "")))
-
-    terms = set()
-    for row in table.find_all("tr"):
-        for cell in row.find_all("td"):
-            text = cell.get_text(separator=" ", strip=True).lower()
-            text = re.sub(r"\s+", " ", text)
-            text = text.replace("–", "-")
-
-            chunks = re.split(r"[;•·\u2022,\n]", text)
-            for chunk in chunks:
-                chunk = chunk.strip()
-                if not chunk:
-                    continue
-
-                subphrases = re.split(r"[()]| - ", chunk)
-                for phrase in subphrases:
-                    phrase = phrase.strip()
-                    if not phrase or len(phrase) < 4:
-                        continue
-
-                    if phrase in OVERUSED_WORDS or phrase in SHARED_ROW_LABELS:
-                        continue
-
-                    words = phrase.split()
-                    if all(w in BAD_WORDS for w in words):
-                        continue
-                    if len(words) == 1 and words[0] in OVERUSED_WORDS:
-                        continue
-
-                    if (score_phrase(phrase) >= 3 or _is_medical_phrase_local(phrase)) and not looks_like_junk(phrase):
-                        terms.add(phrase)
-                    elif len(words) == 1 and is_medical_term(words[0]):
-                        terms.add(phrase)
-                    elif phrase in SHARED_ROW_LABELS:
-                        terms.add(phrase)
-
-                # Phrase recombination
-                for i in range(len(subphrases) - 1):
-                    combined = f"{subphrases[i].strip()} {subphrases[i+1].strip()}"
-                    combined = combined.strip()
-                    if combined in OVERUSED_WORDS or combined in SHARED_ROW_LABELS:
-                        continue
-                    if len(combined.split()) <= 6 and (score_phrase(combined) >= 3 or _is_medical_phrase_local(combined)) and not looks_like_junk(combined):
-                        terms.add(combined)
-    return terms
-
-def generate_search_index():
-    global_term_count = Counter()
-    term_to_pages = defaultdict(set)
-
-    index = []
-    for html_file in PAGES_DIR.glob("*.html"):
-        soup = BeautifulSoup(html_file.read_text(encoding="utf-8"), "html.parser")
-        tables = soup.find_all("table")
-        if not tables:
-            continue
+        return bool(_JUNK_PATTERN.fullmatch(phrase.replace(" ", "")))
+
+    def _strong(self, phrase, words):
+        return (self.score_phrase(phrase, words) >= 3 or self._is_medical_phrase_local(phrase, words)) and not self.looks_like_junk(phrase)
+
+    def _decide(self, phrase, combined):
+        if phrase in self.overused_words or phrase in self.shared_row_labels:
+            return False
+        words = phrase.split()
+        if not words:
+            return False
+        if combined:
+            # Recombined neighbours only count when short and strong on their own
+            return len(words) <= 6 and self._strong(phrase, words)
+        if len(phrase) < 4:
+            return False
+        if all(w in self.BAD_WORDS for w in words):
+            return False
+        if len(words) == 1 and words[0] in self.overused_words:
+            return False
+        if self._strong(phrase, words):
+            return True
+        return len(words) == 1 and self.medical_term(words[0])
+
+    def keep(self, phrase, combined=False):
+        """Memoized keep/drop decision for a subphrase (or a recombination of two)."""
+        key = (phrase, combined)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decisions[key] = self._decide(phrase, combined)
+        return decision
+
+    @staticmethod
+    def candidates(text):
+        """Yield (phrase, combined) for every subphrase of a cell and each recombination of neighbouring subphrases."""
+        text = _WHITESPACE.sub(" ", text.lower()).replace("–", "-")
+        for chunk in _CHUNK_SPLIT.split(text):
+            chunk = chunk.strip()
+            if not chunk:
+                continue
+            previous = None
+            for phrase in _SUBPHRASE_SPLIT.split(chunk):
+                phrase = phrase.strip()
+                yield phrase, False
+                if previous is not None:
+                    yield f"{previous} {phrase}".strip(), True
+                previous = phrase
+
+    def extract(self, cell_texts):
+        """Return the set of terms found in an iterable of cell texts."""
+        terms = set()
+        for text in cell_texts:
+            for phrase, combined in self.candidates(text):
+                if self.keep(phrase, combined):
+                    terms.add(phrase)
+        return terms
+
+    def locate(self, cells):
+        """Map each term found in (cell id, text) pairs to the ids of the cells containing it, in page order."""
+        locations = {}
+        for cell_id, text in cells:
+            for phrase, combined in self.candidates(text):
+                if self.keep(phrase, combined):
+                    ids = locations.setdefault(phrase, [])
+                    if cell_id and (not ids or ids[-1] != cell_id):
+                        ids.append(cell_id)
+        return locations
+
+
+TERM_EXTRACTOR = TermExtractor()
+
+
+def extract_terms_from_table(table):
+    return TERM_EXTRACTOR.extract(table_cell_texts(table))
 
-        all_terms = set()
-        for table in tables:
-            all_terms.update(extract_terms_from_table(table))
+def locate_page_terms(tables_cells):
+    """Return (term set of each table, term → ids of the cells it appears in across the page)."""
+    table_terms = []
+    term_cells = {}
+    for cells in tables_cells:
+        locations = TERM_EXTRACTOR.locate(cells)
+        table_terms.append(set(locations))
+        for term, ids in locations.items():
+            term_cells.setdefault(term, []).extend(ids)
+    return table_terms, term_cells
 
-        for term in all_terms:
-            global_term_count[term] += 1
-            term_to_pages[term].add(html_file.name)
+def extract_page_terms(doc):
+    """Extract the term set of each table on a built page (and where each term sits), memoized on the document."""
+    if doc.table_terms is None or doc.term_cells is None:
+        doc.table_terms, doc.term_cells = locate_page_terms(doc.cells)
+        METRICS.count("terms", len(doc.term_cells))
+    return doc.table_terms
 
-        section = html_file.stem.replace("-", " ").title()
-        page_text = " ".join(t.get_text(separator=" ", strip=True).lower() for t in tables)
-        for term in sorted(all_terms):
-            if global_term_count[term] > 5 and len(term_to_pages[term]) > 3:
+def page_synonyms(term_cells, page_text) -> dict[str, list[str]]:
+    """Term → sorted HPO synonyms of it that occur in the page text, for the page's terms that have any."""
+    matcher = get_synonym_matcher()
+    if not matcher:
+        return {}
+    # One automaton pass finds every synonym in the page, instead of a substring scan per synonym
+    found = matcher.matches(page_text)
+    hpo_synonyms = get_hpo_synonyms()
+    synonyms = {}
+    for term in term_cells:
+        present = sorted(s for s in hpo_synonyms.get(term, ()) if s in found)
+        if present:
+            synonyms[term] = present
+    return synonyms
+
+def _map_built_page(html_file: Path):
+    """Map phase for one built page: (page name, term → cell ids, term → synonyms present), or None without tables."""
+    html = html_file.read_text(encoding="utf-8")
+    soup = make_soup(html, readonly=True)
+    tables = soup.find_all("table")
+    if not tables:
+        return None
+    _, term_cells = locate_page_terms(table_cells(table) for table in tables)
+    page_text = " ".join(t.get_text(separator=" ", strip=True).lower() for t in tables)
+    return html_file.name, term_cells, page_synonyms(term_cells, page_text)
+
+def _map_built_pages(jobs: int):
+    """Map every page in PAGES_DIR (standalone runs without a build context), in a process pool when jobs > 1."""
+    html_files = sorted(PAGES_DIR.glob("*.html"))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(html_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            mapped = list(pool.map(_map_built_page, html_files, chunksize=max(1, len(html_files) // (jobs * 4))))
+    else:
+        mapped = [_map_built_page(html_file) for html_file in html_files]
+    # Workers' counters don't reach this process, so count here
+    for html_file, page in zip(html_files, mapped):
+        METRICS.count("bytes_read", html_file.stat().st_size)
+        METRICS.count("files_parsed")
+        if page is not None:
+            METRICS.count("terms", len(page[1]))
+    return [page for page in mapped if page is not None]
+
+def _map_context_pages(ctx):
+    """Map phase from the build context: terms come from build_pages (its workers or the build cache)."""
+    ctx.count_loading()
+    pages = []
+    for doc in ctx.documents:
+        if not extract_page_terms(doc):
+            continue
+        pages.append((doc.page_name, doc.term_cells, page_synonyms(doc.term_cells, doc.page_text)))
+    return pages
+
+def reduce_index(pages):
+    """
+    Reduce phase: document frequency over all pages, then the overuse filter and synonym
+    expansion. Yields entries ordered by page name, then term, so the same pages always give
+    the same index regardless of the order they were mapped in; only one entry is built at a time.
+    """
+    pages = sorted(pages, key=lambda page: page[0])
+    document_frequency = Counter(term for _, term_cells, _ in pages for term in term_cells)
+
+    for page_name, term_cells, synonyms in pages:
+        section = Path(page_name).stem.replace("-", " ").title()
+        for term in sorted(term_cells):
+            if document_frequency[term] > MAX_TERM_PAGES:
                 continue  # Overused term
-            index.append({
+            yield {
                 "term": term,
-                "page": html_file.name,
+                "page": page_name,
                 "section": section,
-                "medical": is_medical_phrase(term)
-            })
-            # Include synonym if present in page text and not globally overused
-            for synonym in HPO_SYNONYMS.get(term, set()):
-                if synonym in page_text and synonym not in global_term_count:
-                    index.append({
+                "medical": is_medical_phrase(term),
+                "cells": term_cells[term]
+            }
+            # Include synonyms present in the page text that aren't terms of any page themselves
+            for synonym in synonyms.get(term, ()):
+                if synonym not in document_frequency:
+                    yield {
                         "term": synonym,
-                        "page": html_file.name,
+                        "page": page_name,
                         "section": section,
-                        "medical": is_medical_phrase(synonym)
-                    })
+                        "medical": is_medical_phrase(synonym),
+                        "cells": term_cells[term]  # Where the term it is a synonym of appears
+                    }
+
+def generate_search_index(ctx=None, jobs: int = INDEX_JOBS):
+    """
+    Write the search index and its compact copy, returning the compact manifest. With a build
+    context the annotated tables from build_pages are reused and the index is built at most
+    once per run; without one, the built pages are parsed, `jobs` at a time. Entries stream
+    from the reduce phase into search_index.json and the compact index builder together,
+    so the flat index is never held as a list.
+    """
+    if ctx is not None and ctx.search_index is not None:
+        return ctx.search_index
+
+    pages = _map_context_pages(ctx) if ctx is not None else _map_built_pages(jobs)
+    compact = CompactIndexBuilder()
+
+    def entries():
+        for entry in reduce_index(pages):
+            compact.add(entry)
+            yield entry
+
+    write_json_array(OUTPUT_FILE, entries())
+    print(f"✅ Search index written to {OUTPUT_FILE} with {compact.entries} entries.")
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT_FILE.write_text(json.dumps(index, indent=2))
-    print(f"✅ Search index written to {OUTPUT_FILE} with {len(index)} entries.")
+    # Prefix-sharded copy that the browser actually downloads
+    manifest = write_compact_index(compact, COMPACT_INDEX_DIR)
+    print(f"✅ Compact search index written to {COMPACT_INDEX_DIR}/ ({len(manifest['shards'])} shards).")
+    if ctx is not None:
+        ctx.search_index = manifest
+    return manifest
 
 if __name__ == "__main__":
     generate_search_index()
\ No newline at end of file
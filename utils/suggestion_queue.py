@@ -0,0 +1,228 @@
+import os
+import time
+import asyncio
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+import httpx
+from dotenv import load_dotenv
+load_dotenv()
+
+ROOT = Path(__file__).resolve().parents[1]
+REPO = "sharperdragon/study_tables"
+
+QUEUE_PATH = ROOT / os.getenv("SUGGESTION_QUEUE", "suggestions.sqlite3")
+TARGET_URL = os.getenv("SUGGESTION_TARGET_URL", f"https://api.github.com/repos/{REPO}/issues")
+GITHUB_TOKEN = os.getenv("GH_TOKEN")
+
+BATCH_SIZE = int(os.getenv("SUGGESTION_BATCH_SIZE", "10"))
+POLL_INTERVAL = float(os.getenv("SUGGESTION_POLL_INTERVAL", "5"))
+MAX_ATTEMPTS = int(os.getenv("SUGGESTION_MAX_ATTEMPTS", "8"))
+# How long a claimed batch belongs to one worker before another may take it over
+LEASE_SECONDS = float(os.getenv("SUGGESTION_LEASE_SECONDS", "60"))
+BACKOFF_BASE = 2.0        # Seconds before the first retry; doubles per attempt
+BACKOFF_MAX = 15 * 60.0
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Upstream answers worth retrying; any other 4xx is a permanent failure
+RETRYABLE_STATUS = {403, 408, 429}
+
+"""
+Durable outbox for user suggestions. The API only inserts a row into a local SQLite queue
+and answers at once; SuggestionWorker drains the queue in the background, posting each
+suggestion as an issue over one pooled async HTTP client, a batch at a time, retrying
+failures with exponential backoff. Rows are claimed with a lease before they are sent,
+so several server processes can share one queue without posting a suggestion twice. Identical suggestions (ignoring case and whitespace)
+are stored and sent once; one that failed for good can be submitted again.
+SUGGESTION_TARGET_URL points the worker somewhere other than the GitHub issues API,
+e.g. a local stub server.
+"""
+
+
+def suggestion_digest(text: str) -> str:
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+class SuggestionQueue:
+    def __init__(self, path: Path = QUEUE_PATH):
+        self.path = path
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS suggestions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    body TEXT NOT NULL,
+                    digest TEXT NOT NULL UNIQUE,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL,
+                    created REAL NOT NULL,
+                    last_error TEXT,
+                    lease_until REAL
+                )
+            """)
+            if "lease_until" not in {row[1] for row in db.execute("PRAGMA table_info(suggestions)")}:
+                db.execute("ALTER TABLE suggestions ADD COLUMN lease_until REAL")  # Queues created before leases
+            db.execute("CREATE INDEX IF NOT EXISTS suggestions_due ON suggestions (status, next_attempt)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def enqueue(self, text: str) -> tuple[int, bool]:
+        """
+        Store a suggestion; returns (row id, True if an identical suggestion is already queued or sent).
+        Resubmitting one that failed for good puts it back in the queue with a fresh set of attempts.
+        """
+        now = time.time()
+        digest = suggestion_digest(text)
+        with self._connect() as db:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO suggestions (body, digest, next_attempt, created) VALUES (?, ?, ?, ?)",
+                (text, digest, now, now),
+            )
+            if cursor.rowcount:
+                return cursor.lastrowid, False
+            suggestion_id, status = db.execute("SELECT id, status FROM suggestions WHERE digest = ?", (digest,)).fetchone()
+            if status != "failed":
+                return suggestion_id, True
+            db.execute(
+                "UPDATE suggestions SET body = ?, status = 'pending', attempts = 0, next_attempt = ?, last_error = NULL WHERE id = ?",
+                (text, now, suggestion_id),
+            )
+            return suggestion_id, False
+
+    def claim(self, limit: int = BATCH_SIZE, lease: float = LEASE_SECONDS) -> list[tuple[int, str, int]]:
+        """
+        Atomically take up to `limit` due suggestions, oldest first, as (id, body, attempts): they
+        move to 'sending' until `lease` seconds from now, so no other worker picks them up meanwhile.
+        """
+        now = time.time()
+        with self._connect() as db:
+            rows = db.execute(
+                """
+                UPDATE suggestions SET status = 'sending', lease_until = ?
+                WHERE id IN (SELECT id FROM suggestions WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?)
+                RETURNING id, body, attempts
+                """,
+                (now + lease, now, limit),
+            ).fetchall()
+        return sorted(rows)
+
+    def release_expired(self) -> int:
+        """Put suggestions whose lease ran out (their worker died or was restarted mid-batch) back in the queue."""
+        with self._connect() as db:
+            return db.execute(
+                "UPDATE suggestions SET status = 'pending', lease_until = NULL WHERE status = 'sending' AND lease_until <= ?",
+                (time.time(),),
+            ).rowcount
+
+    def mark_sent(self, suggestion_id: int):
+        with self._connect() as db:
+            db.execute("UPDATE suggestions SET status = 'sent', last_error = NULL, lease_until = NULL WHERE id = ?", (suggestion_id,))
+
+    def mark_failed(self, suggestion_id: int, attempts: int, error: str, retry_after: float = None, permanent: bool = False):
+        """Schedule a retry with exponential backoff, or give up after MAX_ATTEMPTS or a permanent error."""
+        attempts += 1
+        if permanent or attempts >= MAX_ATTEMPTS:
+            status, delay = "failed", 0.0
+        else:
+            status, delay = "pending", retry_after or min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+        with self._connect() as db:
+            db.execute(
+                "UPDATE suggestions SET status = ?, attempts = ?, next_attempt = ?, last_error = ?, lease_until = NULL WHERE id = ?",
+                (status, attempts, time.time() + delay, error, suggestion_id),
+            )
+
+    def counts(self) -> dict:
+        with self._connect() as db:
+            return dict(db.execute("SELECT status, COUNT(*) FROM suggestions GROUP BY status").fetchall())
+
+
+class SuggestionWorker:
+    """Background task that drains a SuggestionQueue to TARGET_URL."""
+
+    def __init__(self, queue: SuggestionQueue, target_url: str = TARGET_URL, token: str = GITHUB_TOKEN,
+                 batch_size: int = BATCH_SIZE, poll_interval: float = POLL_INTERVAL):
+        self.queue = queue
+        self.target_url = target_url
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.headers = {"Accept": "application/vnd.github+json"}
+        if token:
+            self.headers["Authorization"] = f"token {token}"
+        self._wake = asyncio.Event()
+        self._task = None
+        self._client = None
+
+    def notify(self):
+        """Wake the worker right away instead of at the next poll."""
+        self._wake.set()
+
+    async def start(self):
+        released = await asyncio.to_thread(self.queue.release_expired)
+        if released:
+            logging.info(f"Requeued {released} suggestion(s) left mid-send by a previous worker")
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=self.batch_size, max_keepalive_connections=self.batch_size),
+        )
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self):
+        while True:
+            # Cleared before draining, so a notify() that lands during the drain still wakes the next wait
+            self._wake.clear()
+            try:
+                sent = await self.drain_once()
+            except Exception as e:
+                logging.warning(f"Suggestion worker error: {e}")
+                sent = 0
+            if sent < self.batch_size:  # Queue has no more due work; wait for a new suggestion or the next poll
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def drain_once(self) -> int:
+        """Send one batch of due suggestions concurrently; returns how many were attempted."""
+        await asyncio.to_thread(self.queue.release_expired)
+        batch = await asyncio.to_thread(self.queue.claim, self.batch_size)
+        await asyncio.gather(*(self._deliver(*row) for row in batch))
+        return len(batch)
+
+    async def _deliver(self, suggestion_id: int, body: str, attempts: int):
+        try:
+            r = await self._client.post(self.target_url, json={"title": "User Suggestion", "body": body})
+        except httpx.HTTPError as e:
+            await asyncio.to_thread(self.queue.mark_failed, suggestion_id, attempts, f"{type(e).__name__}: {e}")
+            return
+        if r.is_success:
+            await asyncio.to_thread(self.queue.mark_sent, suggestion_id)
+            return
+        retry_after = r.headers.get("Retry-After")
+        await asyncio.to_thread(
+            self.queue.mark_failed, suggestion_id, attempts, f"HTTP {r.status_code}: {r.text[:200]}",
+            float(retry_after) if retry_after and retry_after.isdigit() else None,
+            r.status_code < 500 and r.status_code not in RETRYABLE_STATUS,
+        )
@@ -1,12 +1,30 @@
 import os
-import requests
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+from utils.search_helpers.search_engine import SearchEngine
+from utils.suggestion_queue import SuggestionQueue, SuggestionWorker, QUEUE_PATH
 load_dotenv()
 
-app = FastAPI()
+SEARCH_ENGINE = SearchEngine(cache_size=int(os.getenv("SEARCH_CACHE_SIZE", "256")))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    SEARCH_ENGINE.ensure_loaded()  # Build the in-memory index before the first request
+    # Opened here rather than at import, so importing the module never creates the queue file
+    app.state.suggestion_queue = SuggestionQueue(QUEUE_PATH)
+    app.state.suggestion_worker = SuggestionWorker(app.state.suggestion_queue)
+    await app.state.suggestion_worker.start()
+    try:
+        yield
+    finally:
+        await app.state.suggestion_worker.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,19 +38,16 @@ app.add_middleware(
 class Suggestion(BaseModel):
     suggestion: str
 
-GITHUB_TOKEN = os.getenv("GH_TOKEN")
-REPO = "sharperdragon/study_tables"
-
-@app.post("/api/suggest")
-def create_suggestion(s: Suggestion):
-    url = f"https://api.github.com/repos/{REPO}/issues"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json"
-    }
-    data = {
-        "title": "User Suggestion",
-        "body": s.suggestion
-    }
-    r = requests.post(url, json=data, headers=headers)
-    return {"status": r.status_code, "detail": r.json()}
\ No newline at end of file
+@app.post("/api/suggest", status_code=202)
+async def create_suggestion(s: Suggestion, request: Request):
+    # Only the local queue write happens here; the worker delivers it to the issues API later
+    state = request.app.state
+    suggestion_id, duplicate = await asyncio.to_thread(state.suggestion_queue.enqueue, s.suggestion)
+    state.suggestion_worker.notify()
+    return {"status": "queued", "id": suggestion_id, "duplicate": duplicate}
+
+
+@app.get("/api/search")
+def search(q: str, limit: int = 15):
+    limit = max(1, min(limit, 100))
+    return {"query": q, "results": SEARCH_ENGINE.search(q, limit)}
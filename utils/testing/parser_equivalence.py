@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+# Add project root to sys.path for module imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from utils.build_context import BuildContext
+from utils.page_builder import render_page, BASE_HTML_PATH, TABLE_DIR
+from utils.page_helpers.nav_builder import NavCatalog
+from utils.write_stats import analyze_table_stats
+from utils.static_search import extract_page_terms, extract_terms_from_table
+from utils.page_helpers.parsers import configure_parsers, parser_name, make_soup, SUPPORTED_PARSERS
+
+"""
+Equivalence check for the HTML parser backends: builds every page, the stats and the
+search-index inputs in memory (nothing is written) with each available backend and
+compares them against html.parser. Run from the project root:
+
+    python utils/testing/parser_equivalence.py
+"""
+
+
+def build_outputs(backend: str) -> dict:
+    configure_parsers(backend, backend)
+    base_html = BASE_HTML_PATH.read_text()
+    ctx = BuildContext(TABLE_DIR, use_cache=False)
+    nav = NavCatalog(ctx.table_files)
+    for doc in ctx.documents:
+        render_page(doc, base_html, nav)
+
+    outputs = {
+        "pages": {doc.page_name: doc.page_html for doc in ctx.documents},
+        "summary_cards": {doc.page_name: doc.summary_card for doc in ctx.documents},
+        "stats": analyze_table_stats(ctx.documents),
+        "terms": {doc.page_name: [sorted(t) for t in extract_page_terms(doc)] for doc in ctx.documents},
+        "page_text": {doc.page_name: doc.page_text for doc in ctx.documents},
+    }
+
+    # Read-only paths: stats from a fresh parse, and terms from re-parsing the built pages
+    outputs["stats_fresh"] = analyze_table_stats(BuildContext(TABLE_DIR, use_cache=False).documents)
+    outputs["terms_from_pages"] = {
+        name: [sorted(extract_terms_from_table(t)) for t in make_soup(html, readonly=True).find_all("table")]
+        for name, html in outputs["pages"].items()
+    }
+    return outputs
+
+
+def main() -> int:
+    baseline = build_outputs("html.parser")
+    failures = 0
+    for backend in SUPPORTED_PARSERS:
+        if backend == "html.parser":
+            continue
+        configure_parsers(backend, backend)
+        if parser_name() != backend:
+            print(f"⏭️  {backend}: not installed, skipped")
+            continue
+        outputs = build_outputs(backend)
+        for key, expected in baseline.items():
+            if outputs[key] == expected:
+                print(f"✅ {backend}: {key} matches html.parser")
+                continue
+            failures += 1
+            if isinstance(expected, dict):
+                differing = sorted(k for k in expected if outputs[key].get(k) != expected[k])
+                print(f"❌ {backend}: {key} differs for {', '.join(differing)}")
+            else:
+                print(f"❌ {backend}: {key} differs")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,10 @@
-from bs4 import BeautifulSoup
 from pathlib import Path
 import json
 from datetime import datetime
-from time import time
-from utils.static_search import generate_search_index
-from utils.page_helpers.html_utils import generate_label_and_slug
+from utils.page_helpers.html_utils import generate_label_and_slug, card_description
+from utils.output_optimizer import minify_html
+from utils.asset_fingerprint import fingerprint_assets, rewrite_asset_urls
+from utils.build_metrics import METRICS, update_build_summary
 
 BASE_PATH = Path(__file__).parent
 PROJECT_ROOT = BASE_PATH.parent
@@ -13,17 +13,17 @@ INDEX_BASE_HTML_PATH = BASE_PATH / "index_utils/index_base.html"
 OUTPUT_PATH = PROJECT_ROOT / "index.html"
 
 
-def build_index(build_json=True):
-    """Generate index.html from base template and manifest"""
-    generate_search_index()
+def build_index():
+    """Generate index.html from base template and manifest (no page is opened; build_pages records the card fields)"""
     try:
         with INDEX_BASE_HTML_PATH.open("r", encoding="utf-8") as f:
             base_html = f.read()
     except FileNotFoundError:
         raise FileNotFoundError(f"❌ index_base.html not found at {INDEX_BASE_HTML_PATH}. Double check the path or move the file back.")
 
-    with MANIFEST_PATH.open("r", encoding="utf-8") as f:
-        manifest = json.load(f)
+    manifest_json = MANIFEST_PATH.read_text(encoding="utf-8")
+    METRICS.read(manifest_json)
+    manifest = json.loads(manifest_json)
 
     # Sort manifest entries by name
     manifest_sorted = sorted(manifest, key=lambda x: x["name"])
@@ -33,18 +33,6 @@ def build_index(build_json=True):
     regular_links = []
 
     summary_cards = []
-    card_descriptions = {
-        "Metabolism": "Includes glycolysis, glycogen storage, and fatty acid oxidation disorders",
-        "Hemeonc": "Summarizes hematologic malignancies, anemias, and blood-related findings",
-        "Chromosomes": "Genetic disorders and syndromes organized by chromosome number",
-        "Autoantibodies": "Autoimmune diseases and their associated antibodies",
-        "Glossary": "Relevant terms across pathology, genetics, and neuro — clearly explained with examples",
-        "Lab Tests": "lab tests for diagnosis and management, including tumor markers, infection assays, and metabolic workups",
-        "Associations": "Rapid-fire 'most common' and exam associations",
-        "Presentations": "Clinical buzzwords and presentation patterns linked to classic diagnoses — optimized for fast recall",
-        "Findings": "Diagnostic clues and lab/physical findings tied to conditions, covering exam associations",
-        "Pharm": "Work in progress, but go crazy with these Antibiotics and Immunologics"
-    }
     for entry in manifest_sorted:
         try:
             label, slug = generate_label_and_slug(entry.get("label", entry["name"]))
@@ -54,14 +42,8 @@ def build_index(build_json=True):
 
         nav_html_snippet = f'<a href="{href}" class="home-nav-link">{label}</a>'
 
-        # Check if table.html file explicitly includes summary-card meta
-        page_path = PROJECT_ROOT / href
-        include_card = False
-        if page_path.exists():
-            soup = BeautifulSoup(page_path.read_text(encoding="utf-8"), "html.parser")
-            meta = soup.find("meta", attrs={"name": "summary-card"})
-            if meta and meta.get("content", "").lower() == "true":
-                include_card = True
+        # Card flag and description come from the table's summary-card / description meta, via the manifest
+        include_card = entry.get("summary_card", False)
 
         if label in PINNED_LABELS:
             pinned_links.append(nav_html_snippet)
@@ -69,7 +51,7 @@ def build_index(build_json=True):
             regular_links.append(nav_html_snippet)
 
         if include_card:
-            desc = card_descriptions.get(label, f"A summary table for {label.lower()}.")
+            desc = entry.get("desc") or card_description(label)
             summary_cards.append(
                 f'''<a class="summary-card" href="{href}">
   <div class="card-title">{label}</div>
@@ -108,15 +90,15 @@ def build_index(build_json=True):
     final_html = final_html.replace("{{RAPID_REVIEW_CAROUSEL}}", carousel_html)
     final_html = final_html.replace("{{LAST_UPDATED}}", last_updated_html)
 
+    final_html = minify_html(rewrite_asset_urls(final_html, fingerprint_assets()))
     with OUTPUT_PATH.open("w", encoding="utf-8") as f:
         f.write(final_html)
+    METRICS.wrote(final_html)
 
-    summary = {
+    update_build_summary({
         "generated": "index.html",
-        "updated": datetime.now().isoformat(),
         "included_tables": [entry["name"] for entry in manifest_sorted]
-    }
-    (PROJECT_ROOT / "build_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    })
 
     print(f"✅ index.html written to: {OUTPUT_PATH}")
 
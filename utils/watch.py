@@ -0,0 +1,239 @@
+import os
+import sys
+import time
+import argparse
+import threading
+import traceback
+from pathlib import Path, PurePosixPath
+from urllib.parse import unquote
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from dotenv import load_dotenv
+load_dotenv()
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utils.build_context import BuildContext
+from utils.page_builder import build_pages, BUILD_JOBS
+from utils.static_search import generate_search_index
+from utils.write_stats import write_them_stats
+from utils.update_index import build_index
+from utils.Texts.buzzword_json_builder import convert_buzzwords_to_json
+from utils.asset_fingerprint import is_fingerprinted_copy, SITE_PREFIX
+
+POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", "0.2"))
+DEBOUNCE = float(os.getenv("WATCH_DEBOUNCE", "0.3"))
+PREVIEW_PORT = int(os.getenv("PREVIEW_PORT", "8000"))
+
+# Watched inputs → the stages they feed. "pages" also covers stats and the search index.
+WATCHED = {
+    "subdex/*.table.html": {"pages", "index"},
+    "static/BASE.html": {"pages", "index"},
+    "styles/*.css": {"pages", "index"},
+    "static/table_css/*.css": {"pages", "index"},
+    "java/*.js": {"pages", "index"},
+    "utils/Texts/buzzwords.txt": {"buzzwords", "index"},
+    "utils/index_utils/index_base.html": {"index"},
+}
+ALL_STAGES = {"buzzwords", "pages", "index"}
+
+# What the preview serves: the published site only, never .env, the suggestion queue or the source
+PUBLISHED_FILES = {"index.html"}
+PUBLISHED_DIRS = {"pages", "static", "java", "styles", "assets"}
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();</script>'
+
+"""
+Watch mode: polls the build inputs, waits for a burst of saves to settle, and reruns only
+the stages the changed files feed — a buzzwords edit runs convert_buzzwords_to_json and
+build_index, a table edit re-renders just that table (the rest come from the build cache)
+and refreshes stats, search index and index.html. Unless --no-serve is given, the site is
+served under SITE_PREFIX with a live-reload script injected into every HTML response; only
+the published paths (PUBLISHED_FILES / PUBLISHED_DIRS, no dotfiles) are reachable.
+Run from the project root: python -m utils.watch
+"""
+
+
+def snapshot(root: Path = ROOT) -> dict[Path, tuple[int, int]]:
+    """(mtime, size) of every watched input; fingerprinted asset copies are build outputs and skipped."""
+    state = {}
+    for pattern in WATCHED:
+        for path in root.glob(pattern):
+            if path.is_file() and not is_fingerprinted_copy(path):
+                st = path.stat()
+                state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def affected_stages(changed: set[Path], root: Path = ROOT) -> set[str]:
+    stages = set()
+    for pattern, feeds in WATCHED.items():
+        if any(path.relative_to(root).match(pattern) for path in changed):
+            stages |= feeds
+    return stages
+
+
+def rebuild(stages: set[str], jobs: int = BUILD_JOBS):
+    """Run the given stages in pipeline order."""
+    if "buzzwords" in stages:
+        convert_buzzwords_to_json()
+    if "pages" in stages:
+        ctx = BuildContext()
+        build_pages(ctx, jobs=jobs)
+        write_them_stats(ctx)
+        generate_search_index(ctx)
+        ctx.save_cache()
+    if "index" in stages:
+        build_index()
+
+
+class LiveReload:
+    """Build generation counter that preview clients wait on."""
+
+    def __init__(self):
+        self.generation = 0
+        self._changed = threading.Condition()
+
+    def bump(self):
+        with self._changed:
+            self.generation += 1
+            self._changed.notify_all()
+
+    def wait(self, seen: int, timeout: float) -> int:
+        with self._changed:
+            self._changed.wait_for(lambda: self.generation != seen, timeout)
+            return self.generation
+
+
+def is_published(url_path: str) -> bool:
+    """Whether a request path (with or without SITE_PREFIX) names part of the published site."""
+    path = unquote(url_path.split("?", 1)[0].split("#", 1)[0])
+    rel = path[len(SITE_PREFIX):] if path.startswith(SITE_PREFIX) else path.lstrip("/")
+    parts = PurePosixPath(rel).parts
+    if any(part.startswith(".") for part in parts):
+        return False  # Dotfiles, dot-directories and ".."
+    return not parts or parts[0] in PUBLISHED_DIRS or (len(parts) == 1 and parts[0] in PUBLISHED_FILES)
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    """Serves the project root under SITE_PREFIX, uncached, with live reload injected into HTML."""
+
+    def __init__(self, *args, reloader: LiveReload, **kwargs):
+        self.reloader = reloader
+        super().__init__(*args, directory=str(ROOT), **kwargs)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for build output
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def translate_path(self, path):
+        return super().translate_path("/" + path[len(SITE_PREFIX):] if path.startswith(SITE_PREFIX) else path)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].split("#", 1)[0]
+        if path == LIVE_RELOAD_PATH:
+            return self._stream_reloads()
+        if path == "/":
+            self.send_response(302)
+            self.send_header("Location", SITE_PREFIX)
+            return self.end_headers()
+        if not is_published(path):
+            return self.send_error(404)
+
+        file_path = Path(self.translate_path(path))
+        if file_path.is_dir():
+            file_path = file_path / "index.html"
+        if file_path.suffix != ".html" or not file_path.is_file():
+            return super().do_GET()
+
+        html = file_path.read_text(encoding="utf-8")
+        body = (html.replace("</body>", LIVE_RELOAD_SCRIPT + "</body>", 1) if "</body>" in html
+                else html + LIVE_RELOAD_SCRIPT).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        if not is_published(self.path):
+            return self.send_error(404)
+        super().do_HEAD()
+
+    def _stream_reloads(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        seen = self.reloader.generation
+        try:
+            while True:
+                current = self.reloader.wait(seen, timeout=15)
+                # A comment line keeps idle connections open; a data line makes the page reload
+                self.wfile.write(b"data: reload\n\n" if current != seen else b": ping\n\n")
+                self.wfile.flush()
+                seen = current
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(reloader: LiveReload, port: int = PREVIEW_PORT) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(PreviewHandler, reloader=reloader))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🌐 Preview at http://127.0.0.1:{port}{SITE_PREFIX}")
+    return server
+
+
+def watch(jobs: int = BUILD_JOBS, port: int = PREVIEW_PORT, serve_site: bool = True):
+    """Build once, then rebuild affected stages whenever watched inputs change, until interrupted."""
+    reloader = LiveReload()
+    rebuild(ALL_STAGES, jobs)
+    if serve_site:
+        serve(reloader, port)
+    print(f"👀 Watching {', '.join(WATCHED)}")
+
+    state = snapshot()
+    while True:
+        time.sleep(POLL_INTERVAL)
+        current = snapshot()
+        if current == state:
+            continue
+
+        # Debounce: editors often save several files (or one file several times) in a burst
+        settled_at = time.monotonic() + DEBOUNCE
+        while time.monotonic() < settled_at:
+            time.sleep(POLL_INTERVAL)
+            latest = snapshot()
+            if latest != current:
+                current, settled_at = latest, time.monotonic() + DEBOUNCE
+
+        changed = {path for path in state.keys() | current.keys() if state.get(path) != current.get(path)}
+        state = current
+        stages = affected_stages(changed)
+        print(f"\n🔁 Changed: {', '.join(sorted(p.relative_to(ROOT).as_posix() for p in changed))} → {', '.join(sorted(stages))}")
+        started = time.perf_counter()
+        try:
+            rebuild(stages, jobs)
+        except Exception:
+            traceback.print_exc()
+            print("❌ Rebuild failed; fix the input and save again.")
+            continue
+        print(f"✅ Rebuilt in {time.perf_counter() - started:.2f}s")
+        reloader.bump()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild on input changes and serve a live-reloading preview.")
+    parser.add_argument("--jobs", "-j", type=int, default=BUILD_JOBS,
+                        help="worker processes for page building (0 = one per CPU, default: $BUILD_JOBS or 1)")
+    parser.add_argument("--port", type=int, default=PREVIEW_PORT, help="preview server port (default: $PREVIEW_PORT or 8000)")
+    parser.add_argument("--no-serve", action="store_true", help="only rebuild, don't start the preview server")
+    args = parser.parse_args()
+    try:
+        watch(args.jobs, args.port, not args.no_serve)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
@@ -2,15 +2,150 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 import json, re, sys
-from bs4 import BeautifulSoup
 from collections import defaultdict
 from collections import Counter
 from .search_helpers.stats_build_data import build_data_banks
-
-
-def analyze_table_stats(table_files):
-    deprecated_classes = {"table_old", "unstyled", "legacy"}
-
+from .build_context import BuildContext
+from .artifact_writer import write_json
+
+
+DEPRECATED_CLASSES = {"table_old", "unstyled", "legacy"}
+
+
+_WORD = re.compile(r'\b\w+\b')
+
+
+class TableStats:
+    """
+    Collects the raw counts for one table file in a single traversal per table:
+    every row's cells are found once and every cell's text is taken once.
+    partial() returns them as a JSON-serializable partial that merge_table_stats
+    merges in file order, so partials can be computed in parallel and cached per file.
+    """
+
+    def __init__(self):
+        self.total_tables = 0
+        self.tables_with_sections = 0
+        self.tables_with_no_class = 0
+        self.tables_with_multiple_classes = 0
+        self.tables_with_deprecated_class = 0
+        self.class_counts = Counter()
+        self.file_classes = None
+        self.total_rows = 0
+        self.total_cols = 0
+        self.tables_with_header_row = 0
+        self.tables_with_span = 0
+        self.column_headers = Counter()
+        self.row_labels = Counter()
+        self.rows_with_exactly_2_cols = 0
+        self.tables_with_inconsistent_row_lengths = 0
+        self.tables_with_no_th = 0  # Counted per row, as the original report did
+        self.tables_with_only_th_in_col1 = 0
+        self.th_cells_not_in_first_col = 0
+        self.total_words = 0
+        self.total_cells = 0
+        self.max_rows = 0
+        self.max_cols = 0
+        self.row_dividers_per_table = []
+        self.non_header_words = Counter()
+
+    def add_soup(self, soup):
+        for t in soup.find_all("table"):
+            self.add_table(t)
+        return self
+
+    def add_table(self, t):
+        self.total_tables += 1
+        cls = t.get("class", [])
+        if not cls:
+            self.tables_with_no_class += 1
+        if len(cls) > 1:
+            self.tables_with_multiple_classes += 1
+        if any(c in DEPRECATED_CLASSES for c in cls):
+            self.tables_with_deprecated_class += 1
+        for c in cls:
+            self.class_counts[c] += 1
+        self.file_classes = cls
+
+        rows = t.find_all("tr")
+        self.total_rows += len(rows)
+        self.max_rows = max(self.max_rows, len(rows))
+
+        row_dividers = 0
+        has_th = has_span = has_section = False
+        col_counts = set()
+        for row_idx, row in enumerate(rows):
+            cells = row.find_all(["td", "th"])
+            texts = [cell.get_text(strip=True) for cell in cells]
+            # Structural comparison, as before: a row identical to the first one also counts as a header
+            is_header = row_idx == 0 or row == rows[0]
+
+            if row_idx == 0:
+                # Columns are estimated from the first row, whose cells are also the column headers
+                self.total_cols += len(cells)
+                self.max_cols = max(self.max_cols, len(cells))
+                for text in texts:
+                    if text:
+                        self.column_headers[text.lower()] += 1
+
+            divider_row = False
+            th_cells = []
+            for cell, text in zip(cells, texts):
+                cell_classes = cell.get("class") or []
+                if "row-divider" in cell_classes:
+                    divider_row = True
+                    if cell.name == "td":
+                        has_section = True  # Section rows: a <td class="row-divider"> in the table
+                if cell.name == "th":
+                    has_th = True
+                    th_cells.append(cell)
+                if cell.has_attr("colspan") or cell.has_attr("rowspan"):
+                    has_span = True
+
+                self.total_words += len(text.split())
+                if not is_header:
+                    for word in _WORD.findall(text.lower()):
+                        if len(word) > 2:
+                            self.non_header_words[word] += 1
+            row_dividers += divider_row
+
+            self.total_cells += len(cells)
+            col_counts.add(len(cells))
+            if cells and texts[0]:
+                self.row_labels[texts[0].lower()] += 1
+            if len(cells) == 2:
+                self.rows_with_exactly_2_cols += 1
+
+            if not th_cells:
+                self.tables_with_no_th += 1
+            elif all(th == cells[0] for th in th_cells):
+                self.tables_with_only_th_in_col1 += 1
+            else:
+                self.th_cells_not_in_first_col += 1
+
+        self.row_dividers_per_table.append(row_dividers)
+        self.tables_with_header_row += has_th
+        self.tables_with_span += has_span
+        self.tables_with_sections += has_section
+        if len(col_counts) > 1:
+            self.tables_with_inconsistent_row_lengths += 1
+        return self
+
+    def partial(self) -> dict:
+        partial = dict(vars(self))
+        for key in ("class_counts", "column_headers", "row_labels", "non_header_words"):
+            partial[key] = dict(partial[key])
+        partial["row_dividers_per_table"] = list(self.row_dividers_per_table)
+        return partial
+
+
+def table_stats_partial(soup):
+    """Collect the raw counts for one table file as a JSON-serializable partial (see TableStats)."""
+    return TableStats().add_soup(soup).partial()
+
+
+def merge_table_stats(partials):
+    """Merge (file name, partial) pairs, in file order, into the table_stats.json structure."""
     stats = {
         "total_tables": 0,
         "tables_with_sections": 0,
@@ -19,16 +154,17 @@ def analyze_table_stats(table_files):
         "tables_with_deprecated_class": 0,
         "class_counts": defaultdict(int),
         "file_classes": {},
-        "class_usage_per_file": defaultdict(lambda: defaultdict(int)),
         "unique_classes": [],
         "total_rows": 0,
         "total_cols": 0,
         "tables_with_header_row": 0,
         "tables_with_span": 0,
     }
+    summed_keys = [k for k, v in stats.items() if isinstance(v, int)]
 
     column_header_counter = Counter()
     row_label_counter = Counter()
+    non_header_word_counter = Counter()
     rows_with_exactly_2_cols = 0
     rows_with_mixed_col_counts = 0
     tables_with_inconsistent_row_lengths = 0
@@ -42,91 +178,27 @@ def analyze_table_stats(table_files):
     max_cols = 0
     row_dividers_per_table = []
 
-    non_header_word_counter = Counter()
-
-    for table_file in table_files:
-        soup = BeautifulSoup(table_file.read_text(), "html.parser")
-        tables = soup.find_all("table")
-        stats["total_tables"] += len(tables)
-
-        for t in tables:
-            rows = t.find_all("tr")
-            max_rows = max(max_rows, len(rows))
-            table_row_dividers = sum(1 for row in rows if any("row-divider" in (cls or []) for cls in [cell.get("class") for cell in row.find_all(["td", "th"])]))
-            row_dividers_per_table.append(table_row_dividers)
-
-            stats["total_rows"] += len(rows)
-
-            if any(cell.name == "th" for row in rows for cell in row.find_all(["th", "td"])):
-                stats["tables_with_header_row"] += 1
-
-            if any(cell.has_attr("colspan") or cell.has_attr("rowspan") for row in rows for cell in row.find_all(["td", "th"])):
-                stats["tables_with_span"] += 1
-
-            # estimate columns from the first row
-            if rows:
-                first_row_cells = rows[0].find_all(["td", "th"])
-                stats["total_cols"] += len(first_row_cells)
-                max_cols = max(max_cols, len(first_row_cells))
-
-            # Track column headers
-            if rows:
-                header_cells = rows[0].find_all(["th", "td"])
-                headers = [cell.get_text(strip=True).lower() for cell in header_cells]
-                for h in headers:
-                    if len(h) > 0:
-                        column_header_counter[h] += 1
-
-            cls = t.get("class", [])
-            if not cls:
-                stats["tables_with_no_class"] += 1
-            if len(cls) > 1:
-                stats["tables_with_multiple_classes"] += 1
-            if any(c in deprecated_classes for c in cls):
-                stats["tables_with_deprecated_class"] += 1
-            # Detect tables with section rows: at least one <td class="row-divider"> in the table
-            if any("row-divider" in td.get("class", []) for td in t.find_all("td")):
-                stats["tables_with_sections"] += 1
-            for c in cls:
-                stats["class_counts"][c] += 1
-                stats["class_usage_per_file"][table_file.name][c] += 1
-
-            stats["file_classes"][table_file.name] = cls
-
-            # Row and structure stats
-            col_counts = set()
-            for row in rows:
-                cells = row.find_all(["td", "th"])
-                total_cells += len(cells)
-                for cell in cells:
-                    text = cell.get_text(strip=True)
-                    total_words += len(text.split())
-                    if row != rows[0]:  # skip header row
-                        words = re.findall(r'\b\w+\b', text.lower())
-                        for word in words:
-                            if len(word) > 2:
-                                non_header_word_counter[word] += 1
-
-                col_counts.add(len(cells))
-
-                if cells:
-                    first_cell_text = cells[0].get_text(strip=True).lower()
-                    if len(first_cell_text) > 0:
-                        row_label_counter[first_cell_text] += 1
-
-                if len(cells) == 2:
-                    rows_with_exactly_2_cols += 1
-
-                th_cells = row.find_all("th")
-                if not th_cells:
-                    tables_with_no_th += 1
-                else:
-                    if all(th in row.find_all(["th", "td"])[:1] for th in th_cells):
-                        tables_with_only_th_in_col1 += 1
-                    if any(th not in row.find_all(["th", "td"])[:1] for th in th_cells):
-                        th_cells_not_in_first_col += 1
-            if len(col_counts) > 1:
-                tables_with_inconsistent_row_lengths += 1
+    for name, partial in partials:
+        for key in summed_keys:
+            stats[key] += partial[key]
+        for c, count in partial["class_counts"].items():
+            stats["class_counts"][c] += count
+        if partial["file_classes"] is not None:
+            stats["file_classes"][name] = partial["file_classes"]
+
+        column_header_counter.update(partial["column_headers"])
+        row_label_counter.update(partial["row_labels"])
+        non_header_word_counter.update(partial["non_header_words"])
+        rows_with_exactly_2_cols += partial["rows_with_exactly_2_cols"]
+        tables_with_inconsistent_row_lengths += partial["tables_with_inconsistent_row_lengths"]
+        tables_with_no_th += partial["tables_with_no_th"]
+        tables_with_only_th_in_col1 += partial["tables_with_only_th_in_col1"]
+        th_cells_not_in_first_col += partial["th_cells_not_in_first_col"]
+        total_words += partial["total_words"]
+        total_cells += partial["total_cells"]
+        max_rows = max(max_rows, partial["max_rows"])
+        max_cols = max(max_cols, partial["max_cols"])
+        row_dividers_per_table.extend(partial["row_dividers_per_table"])
 
     # Group class names by prefix and sort alphabetically within each group
     grouped_counts = defaultdict(lambda: defaultdict(dict))
@@ -157,9 +229,6 @@ def analyze_table_stats(table_files):
         fname: sorted(classes) for fname, classes in sorted(stats["file_classes"].items())
     }
 
-    # Remove unused key
-    stats.pop("class_usage_per_file", None)
-
     if stats["total_tables"] > 0:
         stats["avg_rows_per_table"] = round(stats["total_rows"] / stats["total_tables"], 2)
         stats["avg_cols_per_table"] = round(stats["total_cols"] / stats["total_tables"], 2)
@@ -187,18 +256,29 @@ def analyze_table_stats(table_files):
 
     return stats
 
-def write_if_changed(path, content):
-    if not path.exists() or path.read_text() != content:
-        path.write_text(content)
 
-def write_them_stats():
-    table_dir = Path("subdex")
-    table_files = list(table_dir.glob("*.table.html"))
-    stats = analyze_table_stats(table_files)
+def document_stats_partial(doc):
+    """Stats partial for one table document, taken from the build cache when available."""
+    if doc.stats_partial is None:
+        doc.stats_partial = table_stats_partial(doc.pristine_soup())
+    return doc.stats_partial
+
+
+def analyze_table_stats(documents):
+    """Aggregate structure stats over the unannotated trees of the given table documents."""
+    return merge_table_stats((doc.name, document_stats_partial(doc)) for doc in documents)
+
+def write_them_stats(ctx: BuildContext = None):
+    if ctx is None:
+        ctx = BuildContext(Path("subdex"))
+    elif ctx.stats is not None:
+        return  # Already written during this build
+    ctx.count_loading()
+    stats = analyze_table_stats(ctx.documents)
+    ctx.stats = stats
 
     stats_path = Path("table_stats.json")
-    stats_path.parent.mkdir(parents=True, exist_ok=True)
-    write_if_changed(stats_path, json.dumps(stats, indent=2))
+    write_json(stats_path, stats, indent=2)
     print(f"📊 Stats file written to: {stats_path}")
     build_data_banks()
 